@@ -4,13 +4,22 @@ File: backend/agents/alert_agent.py
 """
 
 import asyncio
+import contextlib
+import hashlib
+import heapq
+import itertools
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple, Set, Deque, Callable, Awaitable
+from dataclasses import dataclass, field
 from enum import Enum
+from collections import deque
 import json
 
+import numpy as np
+import orjson
+
 from .base_agent import BaseAgent, AgentType, AgentMessage, MessageType, create_message
 from core.service_registry import BankingServiceRegistry
 from core.dashboard_registry import DashboardRegistry
@@ -18,6 +27,29 @@ from integrations.enhanced_prometheus_client import EnhancedPrometheusClient
 
 logger = logging.getLogger(__name__)
 
+# Caps concurrent Prometheus requests issued by each health agent
+PROMETHEUS_MAX_CONCURRENCY = 8
+
+# (warning, critical) thresholds for system-wide critical metrics
+METRIC_THRESHOLDS: Dict[str, Tuple[float, float]] = {
+    "cache_hit_ratio": (80, 60),
+    "database_connections": (80, 95),
+    "unprocessed_messages": (100, 500),
+    "pod_count": (50, 100)
+}
+
+# Metrics where a higher value is healthier
+HIGHER_IS_BETTER = frozenset({"cache_hit_ratio"})
+
+# Alert message templates per metric, formatted with str.format_map
+ALERT_MESSAGE_TEMPLATES: Dict[str, str] = {
+    "service_health": "{emoji} {service_name} service is {status}",
+    "cache_hit_ratio": "{emoji} Cache hit ratio dropped to {value:.1f}% (threshold: {threshold}%)",
+    "database_connections": "{emoji} Database connections at {value} (threshold: {threshold})",
+    "unprocessed_messages": "{emoji} Unprocessed messages: {value} (threshold: {threshold})"
+}
+DEFAULT_ALERT_MESSAGE_TEMPLATE = "{emoji} {service_name} {metric_name}: {value} (trend: {trend})"
+
 
 class HealthStatus(Enum):
     """Health status levels"""
@@ -27,7 +59,18 @@ class HealthStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Status strings reported by Prometheus overviews -> HealthStatus
+STATUS_BY_VALUE: Dict[str, HealthStatus] = {
+    status.value: status for status in HealthStatus}
+
+STATUS_EMOJI: Dict[HealthStatus, str] = {
+    HealthStatus.CRITICAL: "🚨",
+    HealthStatus.WARNING: "⚠️",
+    HealthStatus.HEALTHY: "✅"
+}
+
+
+@dataclass(slots=True)
 class HealthMetric:
     """Health metric data structure"""
     service_name: str
@@ -38,9 +81,11 @@ class HealthMetric:
     status: HealthStatus
     timestamp: datetime
     trend: str  # "improving", "stable", "degrading"
+    # Monotonic clock reading used for time-window queries
+    ts_float: float = field(default_factory=time.monotonic)
 
 
-@dataclass
+@dataclass(slots=True)
 class HealthAlert:
     """Health alert data structure"""
     alert_id: str
@@ -53,6 +98,33 @@ class HealthAlert:
     resolved: bool = False
 
 
+def to_payload(obj: Any) -> Dict[str, Any]:
+    """Convert a dataclass into a JSON-safe dict for agent message content"""
+    return orjson.loads(orjson.dumps(obj))
+
+
+class TrendBuffer:
+    """Fixed-size ring buffer of metric values with aligned timestamps"""
+
+    def __init__(self, size: int = 30):
+        self.values = np.full(size, np.nan)
+        self.timestamps = np.full(size, np.nan)
+        self.head = 0
+
+    def push(self, value: float, timestamp: float):
+        """Overwrite the oldest slot with a new sample"""
+        index = self.head % len(self.values)
+        self.values[index] = value
+        self.timestamps[index] = timestamp
+        self.head += 1
+
+    def window(self, since: float) -> np.ndarray:
+        """Return values newer than `since` in chronological order"""
+        order = (np.arange(len(self.values)) + self.head) % len(self.values)
+        mask = self.timestamps[order] > since  # NaN slots compare False
+        return self.values[order][mask]
+
+
 class HealthAgent(BaseAgent):
     """Proactive Health Monitoring Agent"""
 
@@ -66,10 +138,49 @@ class HealthAgent(BaseAgent):
 
         # Health monitoring configuration
         self.monitoring_interval = 30  # seconds
-        self.health_history: Dict[str, List[HealthMetric]] = {}
+        self.background_interval = self.monitoring_interval
+        # Clock readings captured once at the start of each monitoring cycle
+        self._cycle_now = datetime.now()
+        self._cycle_monotonic = time.monotonic()
+        self.history_size = 100  # metrics kept per service
+        self.health_history: Dict[str, Deque[HealthMetric]] = {}
+        self.trend_window = 15 * 60  # seconds
+        self.baseline_metrics = frozenset(
+            {"service_health", "cache_hit_ratio", "database_connections"})
+        self.baseline_alpha = 0.05  # EMA smoothing factor
+        self._trend_buffers: Dict[Tuple[str, str], TrendBuffer] = {}
+        # Latest status per service and running tallies for the overview
+        self._last_service_status: Dict[str, HealthStatus] = {}
+        self._status_counts: Dict[HealthStatus, int] = {
+            status: 0 for status in HealthStatus}
+        self._category_cache: Dict[str, str] = {}
         self.active_alerts: Dict[str, HealthAlert] = {}
+        # (service_name, metric_name) -> active alert ids, latest last
+        self._alert_index: Dict[Tuple[str, str], List[str]] = {}
+        # Min-heap of (auto-resolve wall-clock time, alert_id); datetimes, so
+        # the heap and _should_resolve_alert compare the same exact values
+        self._alert_expiry: List[Tuple[datetime, str]] = []
+        # Alerted keys that have since reported a healthy metric
+        self._recovered_keys: Set[Tuple[str, str]] = set()
+        self.alert_auto_resolve = 30 * 60  # seconds
+        # Content signature -> monotonic expiry, catches re-fired duplicates
+        self._signature_seen: Dict[bytes, float] = {}
+        self._signature_expiry: List[Tuple[float, bytes]] = []
+        # Alerts raised during the current cycle, sent as one batch
+        self._pending_alerts: List[Dict[str, Any]] = []
+        # Serialized form of each active alert, built once at creation
+        self._alert_payloads: Dict[str, Dict[str, Any]] = {}
         self.alert_cooldown = 300  # 5 minutes
 
+        # Short-lived Prometheus result cache, kept just under the monitoring
+        # interval so each cycle refreshes while concurrent queries share data
+        self.query_cache_ttl = 25  # seconds
+        self._query_cache: Dict[str, Tuple[float, Any]] = {}
+        self._query_locks: Dict[str, asyncio.Lock] = {}
+        # Per agent, so it never binds to another agent's event loop
+        self._prometheus_semaphore = asyncio.Semaphore(
+            PROMETHEUS_MAX_CONCURRENCY)
+
         # Health baseline learning
         self.baseline_data: Dict[str, Dict[str, float]] = {}
         self.learning_period = 24 * 60 * 60  # 24 hours
@@ -91,13 +202,19 @@ class HealthAgent(BaseAgent):
                     "memory_usage": 0.0,
                     "last_updated": datetime.now().timestamp()
                 }
-                self.health_history[service_name] = []
+                self.health_history[service_name] = deque(
+                    maxlen=self.history_size)
 
             self.log_info(
                 f"Initialized health baselines for {len(self.baseline_data)} services")
         except Exception as e:
             self.log_error(f"Error initializing health baselines: {e}")
 
+    async def stop(self):
+        """Stop the agent and release pooled Prometheus connections"""
+        await super().stop()
+        await self.prometheus_client.close()
+
     async def process_message(self, message: AgentMessage) -> Optional[AgentMessage]:
         """Process incoming messages"""
         try:
@@ -116,26 +233,30 @@ class HealthAgent(BaseAgent):
     async def background_task(self):
         """Continuous health monitoring background task"""
         try:
+            self._begin_cycle()
+
             # Perform health checks
             await self._monitor_all_services()
 
+            # Dispatch alerts raised during this cycle
+            await self._flush_alerts()
+
             # Check for alerts
             await self._evaluate_alerts()
 
-            # Update baselines
-            await self._update_baselines()
-
-            # Wait for next monitoring cycle
-            await asyncio.sleep(self.monitoring_interval)
-
         except Exception as e:
             self.log_error(f"Error in health monitoring background task: {e}")
 
+    def _begin_cycle(self):
+        """Capture the wall-clock and monotonic time shared by this cycle"""
+        self._cycle_now = datetime.now()
+        self._cycle_monotonic = time.monotonic()
+
     async def _monitor_all_services(self):
         """Monitor health of all services"""
         try:
             # Get comprehensive system overview
-            system_overview = await self.prometheus_client.get_system_overview()
+            system_overview = await self._cached_overview()
 
             # Monitor each service category
             for category_name, category_data in system_overview.get("categories", {}).items():
@@ -157,26 +278,27 @@ class HealthAgent(BaseAgent):
 
             for service_name, service_info in services_data.items():
                 status = service_info.get("status", "unknown")
+                value = 1.0 if status == "healthy" else 0.0
 
                 # Create health metric
                 health_metric = HealthMetric(
                     service_name=service_name,
                     metric_name="service_health",
-                    current_value=1.0 if status == "healthy" else 0.0,
+                    current_value=value,
                     threshold_warning=1.0,
                     threshold_critical=0.0,
-                    status=HealthStatus(status if status in [
-                                        "healthy", "warning", "critical"] else "unknown"),
-                    timestamp=datetime.now(),
+                    status=STATUS_BY_VALUE.get(status, HealthStatus.UNKNOWN),
+                    timestamp=self._cycle_now,
+                    ts_float=self._cycle_monotonic,
                     trend=self._calculate_trend(
-                        service_name, "service_health", 1.0 if status == "healthy" else 0.0)
+                        service_name, "service_health", value)
                 )
 
                 # Store in history
                 self._store_health_metric(health_metric)
 
                 # Check if alert is needed
-                if health_metric.status in [HealthStatus.WARNING, HealthStatus.CRITICAL]:
+                if health_metric.status in (HealthStatus.WARNING, HealthStatus.CRITICAL):
                     await self._create_alert(health_metric)
 
         except Exception as e:
@@ -192,10 +314,11 @@ class HealthAgent(BaseAgent):
                 "pod_count": "k8s_pod_count_total"
             }
 
-            for metric_name, query in critical_queries.items():
-                try:
-                    result = await self.prometheus_client.query_metric(query)
+            # One batched round-trip; cached entries are not re-queried
+            results = await self._cached_query_many(critical_queries)
 
+            for metric_name, result in results.items():
+                try:
                     if result.get("status") == "success":
                         value = self._extract_metric_value(result)
                         if value is not None:
@@ -212,7 +335,8 @@ class HealthAgent(BaseAgent):
                                 threshold_critical=self._get_threshold(
                                     metric_name, "critical"),
                                 status=status,
-                                timestamp=datetime.now(),
+                                timestamp=self._cycle_now,
+                                ts_float=self._cycle_monotonic,
                                 trend=self._calculate_trend(
                                     "system", metric_name, value)
                             )
@@ -229,80 +353,128 @@ class HealthAgent(BaseAgent):
         except Exception as e:
             self.log_error(f"Error monitoring critical metrics: {e}")
 
+    async def _cached_fetch(self, key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]],
+                            ttl: Optional[float] = None) -> Dict[str, Any]:
+        """Return a cached Prometheus result or fetch it once for all waiters"""
+        ttl = self.query_cache_ttl if ttl is None else ttl
+
+        cached = self._query_cache.get(key)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+
+        lock = self._query_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another waiter may have refreshed the entry while we queued
+            cached = self._query_cache.get(key)
+            if cached and time.monotonic() < cached[0]:
+                return cached[1]
+
+            async with self._prometheus_semaphore:
+                result = await fetch()
+            if result.get("status", "success") == "success":
+                self._query_cache[key] = (time.monotonic() + ttl, result)
+            return result
+
+    async def _cached_query_many(self, queries: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Query several named metrics, batching every cache miss into one call.
+
+        Misses hold the same per-key locks as _cached_fetch, so concurrent
+        callers wait for one fetch instead of repeating it.
+        """
+        now = time.monotonic()
+        results = {}
+        missing = {}
+
+        for name, query in queries.items():
+            cached = self._query_cache.get(f"query:{query}")
+            if cached and now < cached[0]:
+                results[name] = cached[1]
+            else:
+                missing[name] = query
+
+        if missing:
+            async with contextlib.AsyncExitStack() as stack:
+                # Sorted so overlapping batches always lock in the same order
+                for key in sorted({f"query:{query}" for query in missing.values()}):
+                    await stack.enter_async_context(
+                        self._query_locks.setdefault(key, asyncio.Lock()))
+
+                # Another waiter may have refreshed entries while we queued
+                now = time.monotonic()
+                for name, query in list(missing.items()):
+                    cached = self._query_cache.get(f"query:{query}")
+                    if cached and now < cached[0]:
+                        results[name] = cached[1]
+                        del missing[name]
+
+                if missing:
+                    async with self._prometheus_semaphore:
+                        fetched = await self.prometheus_client.query_many(missing)
+
+                    expiry = time.monotonic() + self.query_cache_ttl
+                    for name, result in fetched.items():
+                        if result.get("status") == "success":
+                            self._query_cache[f"query:{missing[name]}"] = (
+                                expiry, result)
+                        results[name] = result
+
+        return {name: results[name] for name in queries}
+
+    async def _cached_overview(self, ttl: Optional[float] = None) -> Dict[str, Any]:
+        """Get the Prometheus system overview through the TTL cache"""
+        return await self._cached_fetch(
+            "system_overview", self.prometheus_client.get_system_overview, ttl)
+
     def _extract_metric_value(self, result: Dict[str, Any]) -> Optional[float]:
         """Extract numeric value from Prometheus response"""
         try:
-            data = result.get("data", {})
-            inner_data = data.get("data", {})
-            result_data = inner_data.get("result", [])
-
-            if result_data:
-                value = result_data[0].get("value", [])
-                if len(value) >= 2:
-                    return float(value[1])
-        except Exception:
-            pass
-        return None
+            return float(result["data"]["data"]["result"][0]["value"][1])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
 
     def _evaluate_metric_health(self, metric_name: str, value: float) -> HealthStatus:
         """Evaluate health status based on metric value"""
-        thresholds = {
-            "cache_hit_ratio": {"warning": 80, "critical": 60},
-            "database_connections": {"warning": 80, "critical": 95},
-            "unprocessed_messages": {"warning": 100, "critical": 500},
-            "pod_count": {"warning": 50, "critical": 100}
-        }
+        thresholds = METRIC_THRESHOLDS.get(metric_name)
+        if thresholds is None:
+            return HealthStatus.HEALTHY
 
-        if metric_name in thresholds:
-            warning_threshold = thresholds[metric_name]["warning"]
-            critical_threshold = thresholds[metric_name]["critical"]
+        warning_threshold, critical_threshold = thresholds
 
-            if metric_name == "cache_hit_ratio":
-                # Higher is better
-                if value < critical_threshold:
-                    return HealthStatus.CRITICAL
-                elif value < warning_threshold:
-                    return HealthStatus.WARNING
-            else:
-                # Lower is better
-                if value > thresholds[metric_name]["critical"]:
-                    return HealthStatus.CRITICAL
-                elif value > warning_threshold:
-                    return HealthStatus.WARNING
+        if metric_name in HIGHER_IS_BETTER:
+            if value < critical_threshold:
+                return HealthStatus.CRITICAL
+            elif value < warning_threshold:
+                return HealthStatus.WARNING
+        else:
+            if value > critical_threshold:
+                return HealthStatus.CRITICAL
+            elif value > warning_threshold:
+                return HealthStatus.WARNING
 
         return HealthStatus.HEALTHY
 
     def _get_threshold(self, metric_name: str, threshold_type: str) -> Optional[float]:
         """Get threshold value for metric"""
-        thresholds = {
-            "cache_hit_ratio": {"warning": 80, "critical": 60},
-            "database_connections": {"warning": 80, "critical": 95},
-            "unprocessed_messages": {"warning": 100, "critical": 500},
-            "pod_count": {"warning": 50, "critical": 100}
-        }
-
-        return thresholds.get(metric_name, {}).get(threshold_type)
+        thresholds = METRIC_THRESHOLDS.get(metric_name)
+        if thresholds is None or threshold_type not in ("warning", "critical"):
+            return None
+        return thresholds[0 if threshold_type == "warning" else 1]
 
     def _calculate_trend(self, service_name: str, metric_name: str, current_value: float) -> str:
         """Calculate trend for a metric"""
         try:
-            if service_name not in self.health_history:
+            buffer = self._trend_buffers.get((service_name, metric_name))
+            if buffer is None:
                 return "stable"
 
-            recent_metrics = [
-                m for m in self.health_history[service_name]
-                if m.metric_name == metric_name and
-                m.timestamp > datetime.now() - timedelta(minutes=15)
-            ]
-
-            if len(recent_metrics) < 3:
+            values = buffer.window(self._cycle_monotonic - self.trend_window)
+            if len(values) < 3:
                 return "stable"
 
             # Calculate trend
-            values = [m.current_value for m in recent_metrics]
-            avg_first_half = sum(values[:len(values)//2]) / (len(values)//2)
-            avg_second_half = sum(
-                values[len(values)//2:]) / (len(values) - len(values)//2)
+            half = len(values) // 2
+            avg_first_half = np.mean(values[:half])
+            avg_second_half = np.mean(values[half:])
 
             if avg_second_half > avg_first_half * 1.1:
                 return "improving"
@@ -318,13 +490,51 @@ class HealthAgent(BaseAgent):
     def _store_health_metric(self, metric: HealthMetric):
         """Store health metric in history"""
         if metric.service_name not in self.health_history:
-            self.health_history[metric.service_name] = []
+            self.health_history[metric.service_name] = deque(
+                maxlen=self.history_size)
 
+        # Bounded deques evict the oldest metric in O(1)
         self.health_history[metric.service_name].append(metric)
 
-        # Keep only last 100 metrics per service
-        if len(self.health_history[metric.service_name]) > 100:
-            self.health_history[metric.service_name].pop(0)
+        previous_status = self._last_service_status.get(metric.service_name)
+        if previous_status != metric.status:
+            if previous_status is not None:
+                self._status_counts[previous_status] -= 1
+            self._status_counts[metric.status] += 1
+            self._last_service_status[metric.service_name] = metric.status
+
+        key = (metric.service_name, metric.metric_name)
+        if key not in self._trend_buffers:
+            # Sized to hold one trend window of monitoring cycles
+            self._trend_buffers[key] = TrendBuffer(
+                self.trend_window // self.monitoring_interval)
+        self._trend_buffers[key].push(metric.current_value, metric.ts_float)
+
+        if metric.status == HealthStatus.HEALTHY and key in self._alert_index:
+            self._recovered_keys.add(key)
+
+        # Update baseline as an exponential moving average
+        if metric.metric_name in self.baseline_metrics:
+            baseline = self.baseline_data.setdefault(metric.service_name, {})
+            previous = baseline.get(metric.metric_name, metric.current_value)
+            baseline[metric.metric_name] = (
+                self.baseline_alpha * metric.current_value +
+                (1 - self.baseline_alpha) * previous
+            )
+            baseline["last_updated"] = metric.timestamp.timestamp()
+
+    def _recent_metrics(self, service_name: str, window_seconds: float) -> List[HealthMetric]:
+        """Get metrics recorded for a service within the last window_seconds"""
+        history = self.health_history.get(service_name)
+        if not history:
+            return []
+
+        # History is append-only and time-ordered, so the window is its tail
+        cutoff = time.monotonic() - window_seconds
+        recent = list(itertools.takewhile(
+            lambda m: m.ts_float > cutoff, reversed(history)))
+        recent.reverse()
+        return recent
 
     async def _create_alert(self, metric: HealthMetric):
         """Create health alert"""
@@ -336,6 +546,10 @@ class HealthAgent(BaseAgent):
             if existing_alert:
                 return
 
+            # Suppress alerts with identical content raised within cooldown
+            if self._is_duplicate_signature(metric):
+                return
+
             # Create alert
             alert = HealthAlert(
                 alert_id=alert_id,
@@ -354,78 +568,126 @@ class HealthAgent(BaseAgent):
             )
 
             self.active_alerts[alert_id] = alert
-
-            # Send alert message
-            alert_message = create_message(
-                sender=self.agent_id,
-                recipient="analysis_agent",
-                message_type=MessageType.ALERT,
-                content={
-                    "alert": alert.__dict__,
-                    "metric": metric.__dict__
-                },
-                priority=3 if metric.status == HealthStatus.CRITICAL else 2
-            )
-
-            await self.send_message(alert_message)
+            self._alert_index.setdefault(
+                (metric.service_name, metric.metric_name), []).append(alert_id)
+            heapq.heappush(self._alert_expiry, (
+                metric.timestamp + timedelta(seconds=self.alert_auto_resolve),
+                alert_id))
+            self._alert_payloads[alert_id] = to_payload(alert)
+
+            # Queue alert for the end-of-cycle batch
+            self._pending_alerts.append({
+                "alert": self._alert_payloads[alert_id],
+                "metric": to_payload(metric),
+                "priority": 3 if metric.status == HealthStatus.CRITICAL else 2
+            })
 
             self.log_info(f"Created alert: {alert.message}")
 
         except Exception as e:
             self.log_error(f"Error creating alert: {e}")
 
+    async def _flush_alerts(self):
+        """Send all alerts raised this cycle as a single batched message"""
+        if not self._pending_alerts:
+            return
+
+        pending, self._pending_alerts = self._pending_alerts, []
+
+        alert_message = create_message(
+            sender=self.agent_id,
+            recipient="analysis_agent",
+            message_type=MessageType.ALERT,
+            content={"alerts": pending},
+            priority=max(entry["priority"] for entry in pending)
+        )
+
+        await self.send_message(alert_message)
+
     def _find_similar_alert(self, metric: HealthMetric) -> Optional[HealthAlert]:
         """Find similar active alert within cooldown period"""
-        cooldown_time = datetime.now() - timedelta(seconds=self.alert_cooldown)
+        alert_ids = self._alert_index.get(
+            (metric.service_name, metric.metric_name))
+        if not alert_ids:
+            return None
+
+        alert = self.active_alerts.get(alert_ids[-1])
+        cooldown_time = self._cycle_now - \
+            timedelta(seconds=self.alert_cooldown)
+        if alert is None or alert.timestamp <= cooldown_time:
+            return None
+
+        return alert
 
-        for alert in self.active_alerts.values():
-            if (alert.service_name == metric.service_name and
-                alert.details.get("metric_name") == metric.metric_name and
-                    alert.timestamp > cooldown_time):
-                return alert
+    def _is_duplicate_signature(self, metric: HealthMetric) -> bool:
+        """Check and record the alert content signature for a metric"""
+        signature = hashlib.blake2b(
+            f"{metric.service_name}|{metric.metric_name}|{metric.status.value}|"
+            f"{round(metric.current_value, 1)}".encode(),
+            digest_size=8
+        ).digest()
 
-        return None
+        now = self._cycle_monotonic
+        expiry = self._signature_seen.get(signature)
+        if expiry is not None and now < expiry:
+            return True
+
+        expiry = now + self.alert_cooldown
+        self._signature_seen[signature] = expiry
+        heapq.heappush(self._signature_expiry, (expiry, signature))
+        return False
+
+    def _prune_signatures(self):
+        """Drop alert signatures whose cooldown has elapsed"""
+        now = self._cycle_monotonic
+        while self._signature_expiry and self._signature_expiry[0][0] <= now:
+            expiry, signature = heapq.heappop(self._signature_expiry)
+            if self._signature_seen.get(signature) == expiry:
+                del self._signature_seen[signature]
 
     def _get_service_category(self, service_name: str) -> str:
-        """Get service category"""
+        """Get service category (registry contents are stable per run)"""
+        if service_name in self._category_cache:
+            return self._category_cache[service_name]
+
+        category = "unknown"
         try:
             service = self.service_registry.get_service(service_name)
             if service:
-                return service.category.value
+                category = service.category.value
         except Exception:
             pass
-        return "unknown"
+
+        self._category_cache[service_name] = category
+        return category
 
     def _generate_alert_message(self, metric: HealthMetric) -> str:
         """Generate human-readable alert message"""
-        status_emoji = {
-            HealthStatus.CRITICAL: "🚨",
-            HealthStatus.WARNING: "⚠️",
-            HealthStatus.HEALTHY: "✅"
-        }
-
-        emoji = status_emoji.get(metric.status, "❓")
-
-        if metric.metric_name == "service_health":
-            return f"{emoji} {metric.service_name} service is {metric.status.value}"
-        elif metric.metric_name == "cache_hit_ratio":
-            return f"{emoji} Cache hit ratio dropped to {metric.current_value:.1f}% (threshold: {metric.threshold_warning}%)"
-        elif metric.metric_name == "database_connections":
-            return f"{emoji} Database connections at {metric.current_value} (threshold: {metric.threshold_warning})"
-        elif metric.metric_name == "unprocessed_messages":
-            return f"{emoji} Unprocessed messages: {metric.current_value} (threshold: {metric.threshold_warning})"
-        else:
-            return f"{emoji} {metric.service_name} {metric.metric_name}: {metric.current_value} (trend: {metric.trend})"
+        template = ALERT_MESSAGE_TEMPLATES.get(
+            metric.metric_name, DEFAULT_ALERT_MESSAGE_TEMPLATE)
+
+        return template.format_map({
+            "emoji": STATUS_EMOJI.get(metric.status, "❓"),
+            "service_name": metric.service_name,
+            "metric_name": metric.metric_name,
+            "status": metric.status.value,
+            "value": metric.current_value,
+            "threshold": metric.threshold_warning,
+            "trend": metric.trend
+        })
 
     async def _evaluate_alerts(self):
         """Evaluate and potentially resolve alerts"""
         try:
-            current_time = datetime.now()
+            current_time = self._cycle_now
             resolved_alerts = []
+            self._prune_signatures()
+
+            for alert_id in self._resolution_candidates(current_time):
+                alert = self.active_alerts.get(alert_id)
 
-            for alert_id, alert in self.active_alerts.items():
                 # Check if alert should be resolved
-                if self._should_resolve_alert(alert, current_time):
+                if alert and self._should_resolve_alert(alert, current_time):
                     alert.resolved = True
                     resolved_alerts.append(alert_id)
 
@@ -435,7 +697,7 @@ class HealthAgent(BaseAgent):
                         recipient="analysis_agent",
                         message_type=MessageType.STATUS,
                         content={
-                            "alert_resolved": alert.__dict__,
+                            "alert_resolved": to_payload(alert),
                             "resolution_time": current_time.isoformat()
                         },
                         priority=1
@@ -446,15 +708,37 @@ class HealthAgent(BaseAgent):
 
             # Remove resolved alerts
             for alert_id in resolved_alerts:
-                del self.active_alerts[alert_id]
+                alert = self.active_alerts.pop(alert_id)
+                self._alert_payloads.pop(alert_id, None)
+                key = (alert.service_name, alert.details.get("metric_name"))
+                alert_ids = self._alert_index.get(key, [])
+                if alert_id in alert_ids:
+                    alert_ids.remove(alert_id)
+                if not alert_ids:
+                    self._alert_index.pop(key, None)
 
         except Exception as e:
             self.log_error(f"Error evaluating alerts: {e}")
 
+    def _resolution_candidates(self, current_time: datetime) -> List[str]:
+        """Collect alerts that have expired or whose metric has recovered"""
+        candidates = []
+
+        # Strictly past the deadline, matching _should_resolve_alert
+        while self._alert_expiry and self._alert_expiry[0][0] < current_time:
+            candidates.append(heapq.heappop(self._alert_expiry)[1])
+
+        for key in self._recovered_keys:
+            candidates.extend(self._alert_index.get(key, []))
+        self._recovered_keys.clear()
+
+        # Preserve order while dropping alerts that are both expired and recovered
+        return list(dict.fromkeys(candidates))
+
     def _should_resolve_alert(self, alert: HealthAlert, current_time: datetime) -> bool:
         """Check if alert should be resolved"""
         # Auto-resolve after 30 minutes
-        if current_time - alert.timestamp > timedelta(minutes=30):
+        if current_time - alert.timestamp > timedelta(seconds=self.alert_auto_resolve):
             return True
 
         # Check if the condition has improved
@@ -463,9 +747,8 @@ class HealthAgent(BaseAgent):
 
         if service_name in self.health_history:
             recent_metrics = [
-                m for m in self.health_history[service_name]
-                if m.metric_name == metric_name and
-                m.timestamp > current_time - timedelta(minutes=5)
+                m for m in self._recent_metrics(service_name, 5 * 60)
+                if m.metric_name == metric_name
             ]
 
             if recent_metrics:
@@ -475,38 +758,6 @@ class HealthAgent(BaseAgent):
 
         return False
 
-    async def _update_baselines(self):
-        """Update health baselines based on recent data"""
-        try:
-            current_time = datetime.now()
-
-            for service_name, metrics in self.health_history.items():
-                recent_metrics = [
-                    m for m in metrics
-                    if current_time - m.timestamp < timedelta(hours=1)
-                ]
-
-                if recent_metrics:
-                    # Update baseline values
-                    if service_name not in self.baseline_data:
-                        self.baseline_data[service_name] = {}
-
-                    for metric_name in ["service_health", "cache_hit_ratio", "database_connections"]:
-                        metric_values = [
-                            m.current_value for m in recent_metrics
-                            if m.metric_name == metric_name
-                        ]
-
-                        if metric_values:
-                            avg_value = sum(metric_values) / len(metric_values)
-                            self.baseline_data[service_name][metric_name] = avg_value
-
-                    self.baseline_data[service_name]["last_updated"] = current_time.timestamp(
-                    )
-
-        except Exception as e:
-            self.log_error(f"Error updating baselines: {e}")
-
     async def _handle_health_query(self, message: AgentMessage) -> AgentMessage:
         """Handle health query from other agents"""
         try:
@@ -535,8 +786,7 @@ class HealthAgent(BaseAgent):
                 )
 
             elif query_type == "active_alerts":
-                alerts_data = [
-                    alert.__dict__ for alert in self.active_alerts.values()]
+                alerts_data = list(self._alert_payloads.values())
 
                 return create_message(
                     sender=self.agent_id,
@@ -557,12 +807,12 @@ class HealthAgent(BaseAgent):
 
     async def _handle_status_request(self, message: AgentMessage) -> AgentMessage:
         """Handle status request"""
-        status_data = self.get_status()
-        status_data.update({
+        status_data = {
+            **self.get_status(),
             "active_alerts": len(self.active_alerts),
             "monitored_services": len(self.health_history),
             "last_monitoring_cycle": self.last_activity.isoformat()
-        })
+        }
 
         return create_message(
             sender=self.agent_id,
@@ -576,10 +826,7 @@ class HealthAgent(BaseAgent):
         if service_name not in self.health_history:
             return {"error": "Service not found"}
 
-        recent_metrics = [
-            m for m in self.health_history[service_name]
-            if m.timestamp > datetime.now() - timedelta(hours=1)
-        ]
+        recent_metrics = self._recent_metrics(service_name, 60 * 60)
 
         if not recent_metrics:
             return {"error": "No recent health data"}
@@ -597,19 +844,9 @@ class HealthAgent(BaseAgent):
     def _get_system_health_overview(self) -> Dict[str, Any]:
         """Get system-wide health overview"""
         total_services = len(self.health_history)
-        healthy_services = 0
-        warning_services = 0
-        critical_services = 0
-
-        for service_name, metrics in self.health_history.items():
-            if metrics:
-                latest_metric = metrics[-1]
-                if latest_metric.status == HealthStatus.HEALTHY:
-                    healthy_services += 1
-                elif latest_metric.status == HealthStatus.WARNING:
-                    warning_services += 1
-                elif latest_metric.status == HealthStatus.CRITICAL:
-                    critical_services += 1
+        healthy_services = self._status_counts[HealthStatus.HEALTHY]
+        warning_services = self._status_counts[HealthStatus.WARNING]
+        critical_services = self._status_counts[HealthStatus.CRITICAL]
 
         return {
             "total_services": total_services,
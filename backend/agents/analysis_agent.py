@@ -4,23 +4,65 @@ File: backend/agents/analysis_agent.py
 """
 
 import asyncio
+import functools
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple, Deque, Callable
+from dataclasses import dataclass, asdict
 from enum import Enum
-import json
-from collections import defaultdict
+import itertools
+import re
+import sys
+from collections import Counter, defaultdict, deque, OrderedDict
+
+import numpy as np
 
 from .base_agent import BaseAgent, AgentType, AgentMessage, MessageType, create_message
 from .alert_agent import HealthAlert, HealthMetric
 from core.service_registry import BankingServiceRegistry
 from core.dashboard_registry import DashboardRegistry
 from integrations.enhanced_prometheus_client import EnhancedPrometheusClient
-from llm.openai_client import OpenAIClient
 
 logger = logging.getLogger(__name__)
 
+# Detail fields kept on stored analyses; the rest is dropped after analysis
+COMPACT_DETAIL_KEYS = ("resolved", "service_name", "severity")
+
+# RE2 metacharacters, escaped when a name is matched literally in PromQL
+_PROMQL_REGEX_META = re.compile(r"([\\.+*?()|\[\]{}^$])")
+
+
+def _promql_regex_literal(text: str) -> str:
+    """Escape text to match literally in a double-quoted PromQL regex"""
+    pattern = _PROMQL_REGEX_META.sub(r"\\\1", text)
+    # The string literal itself needs its backslashes and quotes escaped
+    return pattern.replace("\\", "\\\\").replace('"', '\\"')
+
+AI_INSIGHTS_PROMPT_TEMPLATE = """
+You are an expert system administrator analyzing a banking system alert.
+
+Alert Details:
+- Service: {service}
+- Severity: {severity}
+- Message: {message}
+
+Current Findings:
+{findings}
+
+System Context:
+- This is a banking system with 31+ services
+- Services include: core banking, ML detection, infrastructure, messaging
+- System uses Prometheus for monitoring
+
+Provide additional insights and recommendations focusing on:
+1. Potential root causes not yet identified
+2. Immediate action items
+3. Preventive measures
+
+Respond in JSON format with 'findings' and 'recommendations' arrays.
+"""
+
 
 class AnalysisType(Enum):
     """Types of analysis performed"""
@@ -31,7 +73,7 @@ class AnalysisType(Enum):
     DEPENDENCY = "dependency"
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Analysis result data structure"""
     analysis_id: str
@@ -45,7 +87,7 @@ class AnalysisResult:
     details: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceDependency:
     """Service dependency relationship"""
     service: str
@@ -64,16 +106,44 @@ class AnalysisAgent(BaseAgent):
         self.service_registry = BankingServiceRegistry()
         self.dashboard_registry = DashboardRegistry()
         self.prometheus_client = EnhancedPrometheusClient()
-        self.openai_client = OpenAIClient()
+        self._openai_client = None  # created on first use
 
         # Analysis configuration
-        self.analysis_history: List[AnalysisResult] = []
+        self.background_interval = 60  # run every minute
+        self.history_size = 4096  # analyses kept in memory
+        self.analysis_history: Deque[AnalysisResult] = deque(
+            maxlen=self.history_size)
+        # Dict form of the latest analyses, built once at insertion
+        self._recent_analysis_dicts: Deque[Dict[str, Any]] = deque(maxlen=10)
+        # Keep full alert/metric/correlation blobs on analyses (debugging only)
+        self.debug_retain_full_details = False
         self.correlation_cache: Dict[str, List[Tuple[str, float]]] = {}
+        # Metric-set fingerprint -> computed correlations (LRU)
+        self._corr_cache: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._corr_cache_size = 32
+        self._corr_interval_s = 300.0
+        self._last_correlation_monotonic = time.monotonic()
         self.dependency_map: Dict[str, ServiceDependency] = {}
+        # Service -> services that depend on it
+        self._reverse_dep_map: Dict[str, set] = {}
+        # Service -> every service transitively depending on it
+        self._transitive_dependents: Dict[str, frozenset] = {}
+        self._dependency_dicts: Dict[str, Dict[str, Any]] = {}
+        # Category -> service names; clear if the registry is reloaded
+        self._category_names = functools.lru_cache(maxsize=64)(
+            self._category_names_impl)
+        # Dependency set -> PromQL health query
+        self._up_query = functools.lru_cache(maxsize=128)(self._build_up_query)
+
+        # Query type -> handler building the response content
+        self._query_handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "correlation": self._query_correlations,
+            "dependencies": self._query_dependencies,
+            "recent_analyses": self._query_recent_analyses
+        }
 
         # Pattern learning
-        self.pattern_memory: Dict[str,
-                                  List[Dict[str, Any]]] = defaultdict(list)
+        self.pattern_memory: Dict[str, List[Dict[str, Any]]] = {}
         self.correlation_threshold = 0.7
 
         # Initialize service dependencies
@@ -82,6 +152,14 @@ class AnalysisAgent(BaseAgent):
         self.log_info(
             "Analysis Agent initialized with intelligent correlation capabilities")
 
+    @property
+    def openai_client(self):
+        """OpenAI client, imported and constructed on first access"""
+        if self._openai_client is None:
+            from llm.openai_client import OpenAIClient
+            self._openai_client = OpenAIClient()
+        return self._openai_client
+
     def initialize_service_dependencies(self):
         """Initialize service dependency map"""
         try:
@@ -128,16 +206,71 @@ class AnalysisAgent(BaseAgent):
             }
 
             self.dependency_map = dependencies
+
+            # Service names are interned so graph lookups compare by identity
+            reverse_dep_map = defaultdict(set)
+            for svc_name, dependency in dependencies.items():
+                svc_name = sys.intern(svc_name)
+                for dep in dependency.depends_on:
+                    reverse_dep_map[sys.intern(dep)].add(svc_name)
+            self._reverse_dep_map = dict(reverse_dep_map)
+            self._transitive_dependents = self._build_transitive_dependents()
+            self._dependency_dicts = {
+                name: asdict(dependency) for name, dependency in dependencies.items()
+            }
+
             self.log_info(
                 f"Initialized {len(dependencies)} service dependencies")
 
         except Exception as e:
             self.log_error(f"Error initializing service dependencies: {e}")
 
+    def _build_transitive_dependents(self) -> Dict[str, frozenset]:
+        """Compute the transitive dependents of every service in one pass"""
+        reverse = self._reverse_dep_map
+        forward = defaultdict(set)
+        for dep, dependents in reverse.items():
+            for svc_name in dependents:
+                forward[svc_name].add(dep)
+        nodes = set(reverse) | set(forward)
+
+        # Kahn's algorithm: a service is resolved once all its dependents are
+        pending = {node: len(reverse.get(node, ())) for node in nodes}
+        ready = deque(node for node, count in pending.items() if count == 0)
+        closure: Dict[str, frozenset] = {}
+        while ready:
+            node = ready.popleft()
+            reachable = set()
+            for dependent in reverse.get(node, ()):
+                reachable.add(dependent)
+                reachable |= closure[dependent]
+            closure[node] = frozenset(reachable)
+
+            for dep in forward.get(node, ()):
+                pending[dep] -= 1
+                if pending[dep] == 0:
+                    ready.append(dep)
+
+        # Services on or feeding a dependency cycle are never resolved above
+        for node in nodes - closure.keys():
+            reachable = set()
+            stack = list(reverse.get(node, ()))
+            while stack:
+                dependent = stack.pop()
+                if dependent not in reachable:
+                    reachable.add(dependent)
+                    stack.extend(reverse.get(dependent, ()))
+            reachable.discard(node)
+            closure[node] = frozenset(reachable)
+
+        return closure
+
     async def process_message(self, message: AgentMessage) -> Optional[AgentMessage]:
         """Process incoming messages"""
         try:
             if message.message_type == MessageType.ALERT:
+                if "alerts" in message.content:
+                    return await self._analyze_alert_batch(message)
                 return await self._analyze_alert(message)
             elif message.message_type == MessageType.QUERY:
                 return await self._handle_analysis_query(message)
@@ -163,23 +296,78 @@ class AnalysisAgent(BaseAgent):
             # Generate insights
             await self._generate_insights()
 
-            # Wait for next analysis cycle
-            await asyncio.sleep(60)  # Run every minute
-
         except Exception as e:
             self.log_error(f"Error in background analysis task: {e}")
 
+    async def _analyze_alert_batch(self, message: AgentMessage) -> Optional[AgentMessage]:
+        """Analyze a batch of alerts.
+
+        By default one insight per alert is sent to subscribers. With
+        ``return_results`` set, the alerts are analyzed concurrently and a
+        single insight holding the per-alert results in order is returned;
+        the entry of an alert whose analysis failed is None.
+        """
+        alert_messages = [
+            create_message(
+                sender=message.sender,
+                recipient=message.recipient,
+                message_type=MessageType.ALERT,
+                content={"alert": entry.get("alert", {}),
+                         "metric": entry.get("metric", {})},
+                priority=entry.get("priority", message.priority)
+            )
+            for entry in message.content.get("alerts", [])
+        ]
+
+        if message.content.get("return_results"):
+            insights = await asyncio.gather(
+                *(self._analyze_alert(m) for m in alert_messages))
+            return create_message(
+                sender=self.agent_id,
+                recipient=message.sender,
+                message_type=MessageType.INSIGHT,
+                content={"batch_results": [
+                    insight.content if insight else None for insight in insights
+                ]},
+                priority=message.priority
+            )
+
+        for alert_message in alert_messages:
+            insight = await self._analyze_alert(alert_message)
+            if insight:
+                await self.send_message(insight)
+
+        return None
+
     async def _analyze_alert(self, message: AgentMessage) -> Optional[AgentMessage]:
         """Analyze incoming alert and perform root cause analysis"""
         try:
             alert_data = message.content.get("alert", {})
             metric_data = message.content.get("metric", {})
 
-            # Perform root cause analysis
-            root_cause_analysis = await self._perform_root_cause_analysis(alert_data, metric_data)
+            # Intern the service name, which is retained by every stored analysis
+            if isinstance(alert_data.get("service_name"), str):
+                alert_data["service_name"] = sys.intern(
+                    alert_data["service_name"])
 
-            # Perform correlation analysis
-            correlation_analysis = await self._perform_correlation_analysis_for_alert(alert_data)
+            # Root cause and correlation analysis are independent; run them together
+            root_cause_analysis, correlation_analysis = await asyncio.gather(
+                self._perform_root_cause_analysis(alert_data, metric_data),
+                self._perform_correlation_analysis_for_alert(alert_data)
+            )
+
+            if self.debug_retain_full_details:
+                details = {
+                    "alert_data": alert_data,
+                    "metric_data": metric_data,
+                    "correlation_data": correlation_analysis,
+                    "root_cause_data": root_cause_analysis
+                }
+            else:
+                details = {
+                    key: alert_data.get(key) or root_cause_analysis.get(key)
+                    for key in COMPACT_DETAIL_KEYS
+                }
 
             # Generate comprehensive analysis
             analysis_result = AnalysisResult(
@@ -192,16 +380,13 @@ class AnalysisAgent(BaseAgent):
                 affected_services=correlation_analysis.get(
                     "affected_services", []),
                 timestamp=datetime.now(),
-                details={
-                    "alert_data": alert_data,
-                    "metric_data": metric_data,
-                    "correlation_data": correlation_analysis,
-                    "root_cause_data": root_cause_analysis
-                }
+                details=details
             )
 
             # Store analysis
             self.analysis_history.append(analysis_result)
+            analysis_dict = asdict(analysis_result)
+            self._recent_analysis_dicts.append(analysis_dict)
 
             # Generate intelligent response
             response_message = await self._generate_analysis_response(analysis_result)
@@ -214,7 +399,7 @@ class AnalysisAgent(BaseAgent):
                 recipient="broadcast",
                 message_type=MessageType.INSIGHT,
                 content={
-                    "analysis_result": analysis_result.__dict__,
+                    "analysis_result": analysis_dict,
                     "response_message": response_message
                 },
                 priority=message.priority
@@ -290,66 +475,74 @@ class AnalysisAgent(BaseAgent):
     async def _check_dependency_health(self, dependencies: List[str]) -> List[str]:
         """Check health of service dependencies"""
         try:
-            unhealthy_deps = []
-
-            for dep in dependencies:
-                # Query health of dependency
-                health_query = f'up{{job=~".*{dep}.*"}}'
-                try:
-                    result = await self.prometheus_client.query_metric(health_query)
-
-                    if result.get("status") == "success":
-                        value = self._extract_metric_value(result)
-                        if value is not None and value < 1.0:
-                            unhealthy_deps.append(dep)
-                    else:
-                        unhealthy_deps.append(dep)
-
-                except Exception as e:
-                    self.log_warning(f"Could not check health of {dep}: {e}")
-
-            return unhealthy_deps
+            if not dependencies:
+                return []
+
+            # One query covering every dependency instead of one per dependency
+            health_query = self._up_query(tuple(sorted(dependencies)))
+            try:
+                result = await self.prometheus_client.query_metric(health_query)
+            except Exception as e:
+                self.log_warning(f"Could not check health of {dependencies}: {e}")
+                result = None
+
+            if result is None or result.get("status") != "success":
+                if len(dependencies) > 1:
+                    # Retry one dependency at a time so a failing query only
+                    # affects its own dependency
+                    checks = await asyncio.gather(
+                        *(self._check_dependency_health([dep])
+                          for dep in dependencies))
+                    return [dep for dep, unhealthy in zip(dependencies, checks)
+                            if unhealthy]
+                # A query error skips the dependency; a failed query flags it
+                return [] if result is None else list(dependencies)
+
+            # Map each series back to the dependency its job matched, keeping
+            # the first series seen per dependency
+            dep_values: Dict[str, float] = {}
+            for series in result.get("data", {}).get("data", {}).get("result", []):
+                job = series.get("metric", {}).get("job", "")
+                value = series.get("value", [])
+                if len(value) < 2:
+                    continue
+                for dep in dependencies:
+                    if dep in job and dep not in dep_values:
+                        dep_values[dep] = float(value[1])
+
+            return [dep for dep in dependencies if dep_values.get(dep, 1.0) < 1.0]
 
         except Exception as e:
             self.log_error(f"Error checking dependency health: {e}")
             return []
 
+    def _build_up_query(self, dependencies: Tuple[str, ...]) -> str:
+        """Build the PromQL health query for a set of dependencies"""
+        pattern = "|".join(_promql_regex_literal(dep) for dep in dependencies)
+        return f'up{{job=~".*({pattern}).*"}}'
+
     def _extract_metric_value(self, result: Dict[str, Any]) -> Optional[float]:
         """Extract numeric value from Prometheus response"""
         try:
-            data = result.get("data", {})
-            inner_data = data.get("data", {})
-            result_data = inner_data.get("result", [])
-
-            if result_data:
-                value = result_data[0].get("value", [])
-                if len(value) >= 2:
-                    return float(value[1])
-        except Exception:
-            pass
-        return None
+            return float(result["data"]["data"]["result"][0]["value"][1])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
 
     async def _perform_correlation_analysis_for_alert(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform correlation analysis for a specific alert"""
         try:
             service_name = alert_data.get("service_name", "")
-            affected_services = [service_name]
+            affected = {service_name}
 
-            # Check services that depend on this service
-            for svc_name, dependency in self.dependency_map.items():
-                if service_name in dependency.depends_on:
-                    affected_services.append(svc_name)
+            # Services that depend on this service
+            affected |= self._reverse_dep_map.get(service_name, set())
 
             # Check services in same category
             service_category = alert_data.get("category", "")
             if service_category:
-                category_services = [
-                    svc.name for svc in self.service_registry.get_services_by_category(service_category)
-                ]
-                affected_services.extend(category_services)
+                affected.update(self._category_names(service_category))
 
-            # Remove duplicates
-            affected_services = list(set(affected_services))
+            affected_services = list(affected)
 
             return {
                 "affected_services": affected_services,
@@ -361,39 +554,65 @@ class AnalysisAgent(BaseAgent):
             self.log_error(f"Error in correlation analysis: {e}")
             return {"affected_services": [], "impact_level": "low", "correlation_score": 0.0}
 
+    def _category_names_impl(self, category: str) -> Tuple[str, ...]:
+        """Get names of the services registered under a category"""
+        return tuple(
+            sys.intern(svc.name)
+            for svc in self.service_registry.get_services_by_category(category))
+
     def _calculate_impact_level(self, service_name: str) -> str:
         """Calculate impact level of service failure"""
         if service_name in self.dependency_map:
             dependency = self.dependency_map[service_name]
             return dependency.impact_level
 
-        # Check if other services depend on this one
-        dependent_services = [
-            svc_name for svc_name, dep in self.dependency_map.items()
-            if service_name in dep.depends_on
-        ]
+        # Check if other services depend on this one, directly or not
+        dependent_count = len(self._transitive_dependents.get(service_name, ()))
 
-        if len(dependent_services) > 3:
+        if dependent_count > 3:
             return "critical"
-        elif len(dependent_services) > 1:
+        elif dependent_count > 1:
             return "high"
-        elif len(dependent_services) > 0:
+        elif dependent_count > 0:
             return "medium"
         else:
             return "low"
 
+    def _recent_analyses(self, window: timedelta) -> List[AnalysisResult]:
+        """Get analyses recorded within the given window"""
+        # History is append-only and time-ordered, so the window is its tail
+        cutoff = datetime.now() - window
+        recent = list(itertools.takewhile(
+            lambda a: a.timestamp > cutoff, reversed(self.analysis_history)))
+        recent.reverse()
+        return recent
+
+    def _latest_analyses(self, count: int) -> List[AnalysisResult]:
+        """Get the most recent analyses, oldest first"""
+        latest = list(itertools.islice(reversed(self.analysis_history), count))
+        latest.reverse()
+        return latest
+
     async def _analyze_historical_patterns(self, service_name: str, metric_name: str) -> Optional[Dict[str, Any]]:
         """Analyze historical patterns for insights"""
         try:
-            # Look for similar patterns in analysis history
-            similar_patterns = [
-                analysis for analysis in self.analysis_history
+            # Look for similar patterns in the last 7 days of analysis history,
+            # walking back from the newest entry in a single pass
+            cutoff = datetime.now() - timedelta(days=7)
+            if not self.analysis_history or self.analysis_history[-1].timestamp <= cutoff:
+                return None
+
+            pattern_count = 0
+            resolved_patterns = []
+            for analysis in itertools.takewhile(
+                    lambda a: a.timestamp > cutoff, reversed(self.analysis_history)):
                 if (service_name in analysis.affected_services or
-                    service_name in analysis.trigger_event) and
-                analysis.timestamp > datetime.now() - timedelta(days=7)
-            ]
+                        service_name in analysis.trigger_event):
+                    pattern_count += 1
+                    if analysis.details.get("resolved"):
+                        resolved_patterns.append(analysis)
 
-            if not similar_patterns:
+            if not pattern_count:
                 return None
 
             findings = []
@@ -401,17 +620,16 @@ class AnalysisAgent(BaseAgent):
             confidence_boost = 0.0
 
             # Analyze frequency
-            if len(similar_patterns) > 2:
+            if pattern_count > 2:
                 findings.append(
-                    f"Recurring issue: {len(similar_patterns)} similar incidents in last 7 days")
+                    f"Recurring issue: {pattern_count} similar incidents in last 7 days")
                 recommendations.append(
                     "Implement preventive measures for recurring issue")
                 confidence_boost += 0.2
 
-            # Analyze resolution patterns
-            resolved_patterns = [
-                p for p in similar_patterns if p.details.get("resolved")]
+            # Analyze resolution patterns, oldest first
             if resolved_patterns:
+                resolved_patterns.reverse()
                 common_solutions = self._find_common_solutions(
                     resolved_patterns)
                 if common_solutions:
@@ -422,7 +640,7 @@ class AnalysisAgent(BaseAgent):
                 "findings": findings,
                 "recommendations": recommendations,
                 "confidence_boost": confidence_boost,
-                "pattern_count": len(similar_patterns)
+                "pattern_count": pattern_count
             }
 
         except Exception as e:
@@ -432,15 +650,9 @@ class AnalysisAgent(BaseAgent):
     def _find_common_solutions(self, resolved_patterns: List[AnalysisResult]) -> List[str]:
         """Find common solutions from resolved patterns"""
         try:
-            all_recommendations = []
-            for pattern in resolved_patterns:
-                all_recommendations.extend(pattern.recommendations)
-
             # Count frequency of recommendations
-            recommendation_counts = {}
-            for rec in all_recommendations:
-                recommendation_counts[rec] = recommendation_counts.get(
-                    rec, 0) + 1
+            recommendation_counts = Counter(itertools.chain.from_iterable(
+                pattern.recommendations for pattern in resolved_patterns))
 
             # Return recommendations that appear in multiple patterns
             common_solutions = [
@@ -457,40 +669,14 @@ class AnalysisAgent(BaseAgent):
     async def _get_ai_insights(self, alert_data: Dict[str, Any], metric_data: Dict[str, Any], findings: List[str]) -> Optional[Dict[str, Any]]:
         """Get AI-powered insights for the alert"""
         try:
-            # Prepare context for AI
-            context = {
-                "alert": alert_data,
-                "metric": metric_data,
-                "current_findings": findings,
-                "service_dependencies": self.dependency_map,
-                # Last 5 analyses
-                "analysis_history": [a.__dict__ for a in self.analysis_history[-5:]]
-            }
-
-            # Generate AI insights using OpenAI
-            prompt = f"""
-            You are an expert system administrator analyzing a banking system alert.
-            
-            Alert Details:
-            - Service: {alert_data.get('service_name', 'Unknown')}
-            - Severity: {alert_data.get('severity', 'Unknown')}
-            - Message: {alert_data.get('message', 'Unknown')}
-            
-            Current Findings:
-            {chr(10).join(findings) if findings else 'No findings yet'}
-            
-            System Context:
-            - This is a banking system with 31+ services
-            - Services include: core banking, ML detection, infrastructure, messaging
-            - System uses Prometheus for monitoring
-            
-            Provide additional insights and recommendations focusing on:
-            1. Potential root causes not yet identified
-            2. Immediate action items
-            3. Preventive measures
-            
-            Respond in JSON format with 'findings' and 'recommendations' arrays.
-            """
+            # Generate AI insights using OpenAI; only the alert-specific
+            # fields are filled in per call
+            prompt = AI_INSIGHTS_PROMPT_TEMPLATE.format(
+                service=alert_data.get('service_name', 'Unknown'),
+                severity=alert_data.get('severity', 'Unknown'),
+                message=alert_data.get('message', 'Unknown'),
+                findings="\n".join(findings) if findings else 'No findings yet'
+            )
 
             # Note: In a real implementation, you would call OpenAI API here
             # For now, we'll return some intelligent defaults
@@ -518,27 +704,30 @@ class AnalysisAgent(BaseAgent):
         try:
             confidence_desc = "high" if analysis_result.confidence > 0.7 else "medium" if analysis_result.confidence > 0.4 else "low"
 
-            response = f"🔍 **Analysis Complete** (Confidence: {confidence_desc})\n\n"
-            response += f"**Trigger**: {analysis_result.trigger_event}\n\n"
+            parts = [
+                f"🔍 **Analysis Complete** (Confidence: {confidence_desc})\n\n",
+                f"**Trigger**: {analysis_result.trigger_event}\n\n"
+            ]
 
             if analysis_result.findings:
-                response += "**🔎 Key Findings:**\n"
-                for finding in analysis_result.findings:
-                    response += f"• {finding}\n"
-                response += "\n"
+                parts.append("**🔎 Key Findings:**\n")
+                parts.extend(
+                    f"• {finding}\n" for finding in analysis_result.findings)
+                parts.append("\n")
 
             if analysis_result.recommendations:
-                response += "**💡 Recommendations:**\n"
-                for rec in analysis_result.recommendations:
-                    response += f"• {rec}\n"
-                response += "\n"
+                parts.append("**💡 Recommendations:**\n")
+                parts.extend(
+                    f"• {rec}\n" for rec in analysis_result.recommendations)
+                parts.append("\n")
 
             if analysis_result.affected_services:
-                response += f"**🔗 Affected Services:** {', '.join(analysis_result.affected_services)}\n\n"
+                parts.append(
+                    f"**🔗 Affected Services:** {', '.join(analysis_result.affected_services)}\n\n")
 
-            response += f"**📊 Analysis ID:** {analysis_result.analysis_id}"
+            parts.append(f"**📊 Analysis ID:** {analysis_result.analysis_id}")
 
-            return response
+            return "".join(parts)
 
         except Exception as e:
             self.log_error(f"Error generating analysis response: {e}")
@@ -550,22 +739,22 @@ class AnalysisAgent(BaseAgent):
             # This would perform correlation analysis between different metrics
             # For now, we'll implement a basic version
 
-            current_time = datetime.now()
-
             # Analyze correlations every 5 minutes
-            if not hasattr(self, '_last_correlation_analysis'):
-                self._last_correlation_analysis = current_time
-
-            if current_time - self._last_correlation_analysis < timedelta(minutes=5):
+            now = time.monotonic()
+            if now - self._last_correlation_monotonic < self._corr_interval_s:
                 return
 
-            self._last_correlation_analysis = current_time
+            self._last_correlation_monotonic = now
 
             # Get system metrics for correlation
             system_metrics = await self._get_system_metrics_for_correlation()
 
-            # Analyze correlations
-            correlations = self._calculate_correlations(system_metrics)
+            # Analyze correlations, reusing results for an unchanged metric set.
+            # The NumPy work runs in the default executor so message handling
+            # is not stalled behind it.
+            loop = asyncio.get_running_loop()
+            correlations = await loop.run_in_executor(
+                None, self._get_cached_correlations, system_metrics)
 
             # Store strong correlations
             for correlation in correlations:
@@ -593,19 +782,17 @@ class AnalysisAgent(BaseAgent):
                 "error_rate": "rate(http_requests_total{status=~\"5..\"}[5m])"
             }
 
-            for metric_name, query in key_metrics.items():
-                try:
-                    result = await self.prometheus_client.query_metric(query)
-                    value = self._extract_metric_value(result)
+            # Fetch all metrics concurrently; failures come back as error dicts
+            results = await self.prometheus_client.query_many(key_metrics)
 
-                    if value is not None:
-                        if metric_name not in metrics:
-                            metrics[metric_name] = []
-                        metrics[metric_name].append(value)
+            for metric_name, result in results.items():
+                value = self._extract_metric_value(result)
 
-                except Exception as e:
+                if value is not None:
+                    metrics.setdefault(metric_name, []).append(value)
+                elif result.get("status") != "success":
                     self.log_warning(
-                        f"Could not get metric {metric_name}: {e}")
+                        f"Could not get metric {metric_name}: {result.get('error')}")
 
             return metrics
 
@@ -613,31 +800,52 @@ class AnalysisAgent(BaseAgent):
             self.log_error(f"Error getting system metrics: {e}")
             return {}
 
+    def _get_cached_correlations(self, metrics: Dict[str, List[float]]) -> List[Dict[str, Any]]:
+        """Get correlations for a metric set, recomputing only on change"""
+        names = tuple(sorted(metrics))
+        fingerprint = hash(
+            (names, tuple(tuple(metrics[name][-16:]) for name in names)))
+
+        if fingerprint in self._corr_cache:
+            self._corr_cache.move_to_end(fingerprint)
+            return self._corr_cache[fingerprint]
+
+        correlations = self._calculate_correlations(metrics)
+        self._corr_cache[fingerprint] = correlations
+        if len(self._corr_cache) > self._corr_cache_size:
+            self._corr_cache.popitem(last=False)
+
+        return correlations
+
     def _calculate_correlations(self, metrics: Dict[str, List[float]]) -> List[Dict[str, Any]]:
         """Calculate correlations between metrics"""
         try:
             correlations = []
-            metric_names = list(metrics.keys())
-
-            for i in range(len(metric_names)):
-                for j in range(i + 1, len(metric_names)):
-                    metric1 = metric_names[i]
-                    metric2 = metric_names[j]
-
-                    if metric1 in metrics and metric2 in metrics:
-                        values1 = metrics[metric1]
-                        values2 = metrics[metric2]
 
-                        if len(values1) > 1 and len(values2) > 1:
-                            correlation = self._calculate_correlation_coefficient(
-                                values1, values2)
-
-                            correlations.append({
-                                "metric1": metric1,
-                                "metric2": metric2,
-                                "strength": abs(correlation),
-                                "direction": "positive" if correlation > 0 else "negative"
-                            })
+            # Only series with at least two samples can be correlated
+            series = {
+                name: values for name, values in metrics.items() if len(values) > 1
+            }
+            if len(series) < 2:
+                return correlations
+
+            # Compute the full matrix once over the common tail of all series
+            metric_names = list(series)
+            n = min(len(values) for values in series.values())
+            matrix = np.array([series[name][-n:]
+                              for name in metric_names], dtype=np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                coefficients = np.nan_to_num(np.corrcoef(matrix), nan=0.0)
+
+            for (i, metric1), (j, metric2) in itertools.combinations(enumerate(metric_names), 2):
+                correlation = float(coefficients[i, j])
+
+                correlations.append({
+                    "metric1": metric1,
+                    "metric2": metric2,
+                    "strength": abs(correlation),
+                    "direction": "positive" if correlation > 0 else "negative"
+                })
 
             return correlations
 
@@ -645,39 +853,6 @@ class AnalysisAgent(BaseAgent):
             self.log_error(f"Error calculating correlations: {e}")
             return []
 
-    def _calculate_correlation_coefficient(self, values1: List[float], values2: List[float]) -> float:
-        """Calculate Pearson correlation coefficient"""
-        try:
-            n = min(len(values1), len(values2))
-            if n < 2:
-                return 0.0
-
-            # Take last n values
-            x = values1[-n:]
-            y = values2[-n:]
-
-            # Calculate means
-            mean_x = sum(x) / n
-            mean_y = sum(y) / n
-
-            # Calculate correlation coefficient
-            numerator = sum((x[i] - mean_x) * (y[i] - mean_y)
-                            for i in range(n))
-
-            sum_sq_x = sum((x[i] - mean_x) ** 2 for i in range(n))
-            sum_sq_y = sum((y[i] - mean_y) ** 2 for i in range(n))
-
-            denominator = (sum_sq_x * sum_sq_y) ** 0.5
-
-            if denominator == 0:
-                return 0.0
-
-            return numerator / denominator
-
-        except Exception as e:
-            self.log_error(f"Error calculating correlation coefficient: {e}")
-            return 0.0
-
     async def _analyze_patterns(self):
         """Analyze patterns in system behavior"""
         try:
@@ -685,22 +860,15 @@ class AnalysisAgent(BaseAgent):
             # For now, implement basic pattern detection
 
             current_time = datetime.now()
-            recent_analyses = [
-                analysis for analysis in self.analysis_history
-                if current_time - analysis.timestamp < timedelta(hours=24)
-            ]
+            recent_analyses = self._recent_analyses(timedelta(hours=24))
 
             if len(recent_analyses) < 3:
                 return
 
             # Detect recurring issues
-            issue_patterns = {}
+            issue_patterns = Counter()
             for analysis in recent_analyses:
-                for finding in analysis.findings:
-                    if finding in issue_patterns:
-                        issue_patterns[finding] += 1
-                    else:
-                        issue_patterns[finding] = 1
+                issue_patterns.update(analysis.findings)
 
             # Identify patterns that occur frequently
             frequent_patterns = [
@@ -714,7 +882,7 @@ class AnalysisAgent(BaseAgent):
 
                 # Store patterns for future reference
                 for pattern in frequent_patterns:
-                    self.pattern_memory["frequent_issues"].append({
+                    self.pattern_memory.setdefault("frequent_issues", []).append({
                         "pattern": pattern,
                         "occurrences": issue_patterns[pattern],
                         "last_seen": current_time.isoformat()
@@ -733,7 +901,7 @@ class AnalysisAgent(BaseAgent):
 
             # Analyze analysis history for insights
             if len(self.analysis_history) > 5:
-                latest_analyses = self.analysis_history[-5:]
+                latest_analyses = self._latest_analyses(5)
 
                 # Check for increasing alert frequency
                 alert_frequency = len(latest_analyses)
@@ -742,14 +910,9 @@ class AnalysisAgent(BaseAgent):
                         "Alert frequency has increased - consider proactive maintenance")
 
                 # Check for common affected services
-                affected_services = []
-                for analysis in latest_analyses:
-                    affected_services.extend(analysis.affected_services)
-
-                service_counts = {}
-                for service in affected_services:
-                    service_counts[service] = service_counts.get(
-                        service, 0) + 1
+                service_counts = Counter(
+                    service for analysis in latest_analyses
+                    for service in analysis.affected_services)
 
                 frequently_affected = [
                     service for service, count in service_counts.items()
@@ -772,41 +935,14 @@ class AnalysisAgent(BaseAgent):
         """Handle analysis query from other agents"""
         try:
             query_content = message.content
-            query_type = query_content.get("type")
-
-            if query_type == "correlation":
-                service_name = query_content.get("service_name")
-                correlations = self.correlation_cache.get(service_name, [])
-
-                return create_message(
-                    sender=self.agent_id,
-                    recipient=message.sender,
-                    message_type=MessageType.RESPONSE,
-                    content={"correlations": correlations}
-                )
-
-            elif query_type == "dependencies":
-                service_name = query_content.get("service_name")
-                dependencies = self.dependency_map.get(service_name, None)
+            handler = self._query_handlers.get(query_content.get("type"))
 
+            if handler:
                 return create_message(
                     sender=self.agent_id,
                     recipient=message.sender,
                     message_type=MessageType.RESPONSE,
-                    content={
-                        "dependencies": dependencies.__dict__ if dependencies else None}
-                )
-
-            elif query_type == "recent_analyses":
-                recent_analyses = [
-                    analysis.__dict__ for analysis in self.analysis_history[-10:]
-                ]
-
-                return create_message(
-                    sender=self.agent_id,
-                    recipient=message.sender,
-                    message_type=MessageType.RESPONSE,
-                    content={"analyses": recent_analyses}
+                    content=handler(query_content)
                 )
 
         except Exception as e:
@@ -819,15 +955,34 @@ class AnalysisAgent(BaseAgent):
             content={"error": "Unable to process analysis query"}
         )
 
+    def _query_correlations(self, query_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Get cached correlations for a service, or for each of several"""
+        if "service_names" in query_content:
+            return {"batch_results": [
+                {"correlations": self.correlation_cache.get(name, [])}
+                for name in query_content["service_names"]
+            ]}
+        service_name = query_content.get("service_name")
+        return {"correlations": self.correlation_cache.get(service_name, [])}
+
+    def _query_dependencies(self, query_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the dependency definition of a service"""
+        service_name = query_content.get("service_name")
+        return {"dependencies": self._dependency_dicts.get(service_name)}
+
+    def _query_recent_analyses(self, query_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the most recent analyses"""
+        return {"analyses": list(self._recent_analysis_dicts)}
+
     async def _handle_status_request(self, message: AgentMessage) -> AgentMessage:
         """Handle status request"""
-        status_data = self.get_status()
-        status_data.update({
+        status_data = {
+            **self.get_status(),
             "analyses_completed": len(self.analysis_history),
             "correlations_tracked": len(self.correlation_cache),
             "dependencies_mapped": len(self.dependency_map),
             "patterns_detected": len(self.pattern_memory)
-        })
+        }
 
         return create_message(
             sender=self.agent_id,
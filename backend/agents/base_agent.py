@@ -4,17 +4,29 @@ File: backend/agents/base_agent.py
 """
 
 import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
 import logging
+import os
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Deque, Tuple
 from enum import Enum
-import json
+from collections import Counter, defaultdict, deque
+
+import orjson
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Message ids are process-local: pid plus a running counter
+_msg_counter = itertools.count()
+_pid = os.getpid()
+
 
 class AgentType(Enum):
     """Types of agents in the system"""
@@ -35,7 +47,7 @@ class MessageType(Enum):
     STATUS = "status"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AgentMessage:
     """Message structure for agent communication"""
     id: str
@@ -46,9 +58,19 @@ class AgentMessage:
     timestamp: datetime
     priority: int = 1  # 1=low, 2=medium, 3=high, 4=critical
     context: Optional[Dict[str, Any]] = None
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert message to dictionary"""
+    _dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        """Dictionary form of the message, built once"""
+        if self._dict is None:
+            # Frozen instance: cache through object.__setattr__
+            object.__setattr__(self, "_dict", self._build_dict())
+        return self._dict
+
+    def _build_dict(self) -> Dict[str, Any]:
+        """Build the dictionary form of the message"""
         return {
             "id": self.id,
             "sender": self.sender,
@@ -60,6 +82,14 @@ class AgentMessage:
             "context": self.context
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert message to dictionary"""
+        return self.as_dict
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize message to JSON bytes"""
+        return orjson.dumps(self.as_dict)
+
 
 class BaseAgent(ABC):
     """Base class for all WatchTower AI agents"""
@@ -68,14 +98,36 @@ class BaseAgent(ABC):
         self.agent_id = agent_id
         self.agent_type = agent_type
         self.is_running = False
-        self.message_queue = asyncio.Queue()
-        self.subscribers: List[Callable] = []
+        # Entries are (-priority, seq, message): highest priority first,
+        # FIFO within a priority, and messages themselves never compared
+        self.max_queue_size = 10_000  # bound for backpressure
+        self.message_queue = asyncio.PriorityQueue(
+            maxsize=self.max_queue_size)
+        self._seq = itertools.count()
+        self.message_batch_size = 64  # max messages processed per wakeup
+        self._stop_event = asyncio.Event()
+        # Background runs are spaced by background_interval unless
+        # trigger_background_work() wakes the loop early
+        self.background_interval = 1.0
+        self._work_event = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._processor_task: Optional[asyncio.Task] = None
+        # Set while registered with a hub, whose dispatcher then delivers
+        # this agent's messages instead of a per-agent processor task
+        self._hub: Optional["AgentCommunicationHub"] = None
+        # Status snapshot, rebuilt only after a state change
+        self._status_cache: Optional[Dict[str, Any]] = None
+        # Insertion-ordered set of subscriber callbacks
+        self.subscribers: Dict[Callable, None] = {}
         self.context_memory: Dict[str, Any] = {}
 
         # Performance tracking
         self.messages_processed = 0
+        # Activity is tracked on the monotonic clock and mapped back to wall
+        # time through a single reference point
         self.start_time = datetime.now()
-        self.last_activity = datetime.now()
+        self._start_monotonic = time.monotonic()
+        self.last_activity_mono = self._start_monotonic
 
         logger.info(f"Initialized {agent_type.value} agent: {agent_id}")
 
@@ -96,11 +148,24 @@ class BaseAgent(ABC):
             return
 
         self.is_running = True
+        self._stop_event.clear()
+        self._status_cache = None
         logger.info(f"Starting agent: {self.agent_id}")
 
-        # Start message processing and background tasks as separate tasks
-        asyncio.create_task(self._message_processor())
-        asyncio.create_task(self._background_task_wrapper())
+        # Start message processing and background tasks as separate tasks.
+        # They never read context variables, so each gets a fresh empty
+        # context instead of a copy of the caller's.
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._background_task_wrapper(),
+                             context=contextvars.Context())
+        ]
+        if self._hub is not None:
+            self._hub._ensure_dispatcher()
+            # Deliver anything that was queued while the agent was stopped
+            self._hub._start_batch(self.agent_id)
+        else:
+            self._start_message_processor()
 
         # Agent is now started (tasks run in background)
         logger.info(f"Agent {self.agent_id} started successfully")
@@ -108,72 +173,150 @@ class BaseAgent(ABC):
     async def stop(self):
         """Stop the agent"""
         self.is_running = False
+        self._stop_event.set()
+        self._work_event.set()
+        self._status_cache = None
         logger.info(f"Stopping agent: {self.agent_id}")
 
     async def send_message(self, message: AgentMessage):
         """Send message to subscribers"""
-        self.last_activity = datetime.now()
-
-        # Notify all subscribers
-        for subscriber in self.subscribers:
-            try:
-                await subscriber(message)
-            except Exception as e:
-                logger.error(f"Error sending message to subscriber: {e}")
-
-    async def receive_message(self, message: AgentMessage):
-        """Receive message from another agent"""
-        await self.message_queue.put(message)
+        self.last_activity_mono = time.monotonic()
+        self._status_cache = None
+
+        # Notify all subscribers concurrently
+        results = await asyncio.gather(
+            *(subscriber(message) for subscriber in self.subscribers),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error sending message to subscriber: {result}")
+
+    def receive_message(self, message: AgentMessage) -> Awaitable[None]:
+        """Receive message from another agent; returns the awaitable put"""
+        if self._hub is not None:
+            return self._hub._enqueue(self, message)
+        return self.message_queue.put(
+            (-message.priority, next(self._seq), message))
+
+    def queue_size(self) -> int:
+        """Number of messages waiting for this agent"""
+        if self._hub is not None:
+            return self._hub._pending[self.agent_id]
+        return self.message_queue.qsize()
+
+    def queue_full(self) -> bool:
+        """Whether this agent's message backlog is at its bound"""
+        return self.queue_size() >= self.max_queue_size
 
     def subscribe(self, callback: Callable):
         """Subscribe to messages from this agent"""
-        self.subscribers.append(callback)
+        self.subscribers[callback] = None
+        self._status_cache = None
 
     def unsubscribe(self, callback: Callable):
         """Unsubscribe from messages"""
-        if callback in self.subscribers:
-            self.subscribers.remove(callback)
-
-    async def _message_processor(self):
+        self.subscribers.pop(callback, None)
+        self._status_cache = None
+
+    def _start_message_processor(self, after: Optional[asyncio.Task] = None):
+        """Run this agent's own queue processor, used outside a hub"""
+        self._stop_event.clear()
+        self._processor_task = asyncio.get_running_loop().create_task(
+            self._message_processor(after), context=contextvars.Context())
+        self._tasks.append(self._processor_task)
+
+    async def _stop_message_processor(self):
+        """Stop the own queue processor once its current batch is done"""
+        task, self._processor_task = self._processor_task, None
+        if task is not None:
+            self._stop_event.set()
+            await asyncio.wait({task})
+
+    async def _message_processor(self, after: Optional[asyncio.Task] = None):
         """Process incoming messages"""
-        while self.is_running:
-            try:
-                # Wait for message with timeout
-                message = await asyncio.wait_for(
-                    self.message_queue.get(),
-                    timeout=1.0
-                )
-
-                # Process the message
-                response = await self.process_message(message)
-                self.messages_processed += 1
-                self.last_activity = datetime.now()
-
-                # Send response if generated
-                if response:
-                    await self.send_message(response)
-
-            except asyncio.TimeoutError:
-                # No message received, continue
-                continue
-            except Exception as e:
+        if after is not None:
+            # Let the hub finish the batch it was delivering first
+            await asyncio.wait({after})
+
+        stop_wait = asyncio.ensure_future(self._stop_event.wait())
+        try:
+            while self.is_running:
+                # Block until a message arrives or the agent is stopped
+                get_task = asyncio.ensure_future(self.message_queue.get())
+                done, _ = await asyncio.wait(
+                    {get_task, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+                if get_task not in done:
+                    get_task.cancel()
+                    break
+
+                # Drain whatever else is already queued, up to the batch size
+                batch = [get_task.result()[2]]
+                while len(batch) < self.message_batch_size:
+                    try:
+                        batch.append(self.message_queue.get_nowait()[2])
+                    except asyncio.QueueEmpty:
+                        break
+
+                await self._process_batch(batch)
+        finally:
+            stop_wait.cancel()
+
+    async def _process_batch(self, batch: List[AgentMessage]):
+        """Process a batch of messages concurrently and send the responses"""
+        responses = await asyncio.gather(
+            *(self.process_message(message) for message in batch),
+            return_exceptions=True
+        )
+        self.last_activity_mono = time.monotonic()
+        self._status_cache = None
+
+        for response in responses:
+            if isinstance(response, Exception):
                 logger.error(
-                    f"Error processing message in {self.agent_id}: {e}")
+                    f"Error processing message in {self.agent_id}: {response}")
+                continue
+
+            self.messages_processed += 1
+
+            # Send response if generated
+            if response:
+                try:
+                    await self.send_message(response)
+                except Exception as e:
+                    logger.error(
+                        f"Error processing message in {self.agent_id}: {e}")
 
     async def _background_task_wrapper(self):
         """Wrapper for background task with error handling"""
         while self.is_running:
             try:
                 await self.background_task()
-                await asyncio.sleep(1)  # Prevent tight loop
+                try:
+                    await asyncio.wait_for(
+                        self._work_event.wait(), timeout=self.background_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._work_event.clear()
             except Exception as e:
                 logger.error(
                     f"Error in background task for {self.agent_id}: {e}")
                 await asyncio.sleep(5)  # Wait before retrying
 
+    def trigger_background_work(self):
+        """Wake the background loop without waiting for its interval"""
+        self._work_event.set()
+
+    @property
+    def last_activity(self) -> datetime:
+        """Wall-clock time of the last activity"""
+        return self.start_time + timedelta(
+            seconds=self.last_activity_mono - self._start_monotonic)
+
     def update_context(self, key: str, value: Any):
         """Update agent context memory"""
         self.context_memory[key] = value
+        self._status_cache = None
 
     def get_context(self, key: str) -> Any:
         """Get value from agent context memory"""
@@ -182,21 +325,29 @@ class BaseAgent(ABC):
     def clear_context(self):
         """Clear agent context memory"""
         self.context_memory.clear()
+        self._status_cache = None
 
     def get_status(self) -> Dict[str, Any]:
         """Get agent status information"""
-        uptime = datetime.now() - self.start_time
-        return {
-            "agent_id": self.agent_id,
-            "agent_type": self.agent_type.value,
-            "is_running": self.is_running,
-            "messages_processed": self.messages_processed,
-            "uptime_seconds": uptime.total_seconds(),
-            "last_activity": self.last_activity.isoformat(),
-            "queue_size": self.message_queue.qsize(),
-            "subscribers": len(self.subscribers),
-            "context_items": len(self.context_memory)
-        }
+        if self._status_cache is None:
+            self._status_cache = {
+                "agent_id": self.agent_id,
+                "agent_type": self.agent_type.value,
+                "is_running": self.is_running,
+                "messages_processed": None,
+                "uptime_seconds": None,
+                "last_activity": self.last_activity.isoformat(),
+                "queue_size": None,
+                "subscribers": len(self.subscribers),
+                "context_items": len(self.context_memory)
+            }
+
+        # Copy so callers can extend the result; refresh the live fields
+        status = dict(self._status_cache)
+        status["messages_processed"] = self.messages_processed
+        status["uptime_seconds"] = time.monotonic() - self._start_monotonic
+        status["queue_size"] = self.queue_size()
+        return status
 
     def log_info(self, message: str):
         """Log info message with agent context"""
@@ -216,46 +367,219 @@ class AgentCommunicationHub:
 
     def __init__(self):
         self.agents: Dict[str, BaseAgent] = {}
-        self.message_history: List[AgentMessage] = []
         self.max_history = 1000
+        self.message_history: Deque[AgentMessage] = deque(
+            maxlen=self.max_history)
+
+        # One dispatcher serves every registered agent. Entries are
+        # (-priority, seq, agent_id, message). The queue itself is unbounded;
+        # each agent's bound is enforced in _enqueue through its pending
+        # count, and senders wait there for room.
+        self._central_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._pending: Counter = Counter()
+        # Agent id -> futures of senders waiting for room in its backlog
+        self._room_waiters: Dict[str, List[asyncio.Future]] = defaultdict(list)
+        self._dispatcher_task: Optional[asyncio.Task] = None
+        self.dispatch_batch_size = 64
+
+        # Per-agent backlogs of (-priority, seq, message), held until the
+        # agent is running and has no batch in flight. One batch per agent
+        # keeps its messages in order; a slow agent never blocks the others.
+        self._waiting: Dict[str, List[Tuple[int, int, AgentMessage]]] = defaultdict(list)
+        self._agent_batches: Dict[str, asyncio.Task] = {}
 
     def register_agent(self, agent: BaseAgent):
         """Register an agent with the hub"""
         self.agents[agent.agent_id] = agent
+        agent._hub = self
 
         # Subscribe to agent messages
         agent.subscribe(self._handle_message)
 
+        if agent.is_running:
+            # Take delivery over from the agent's own processor. The handover
+            # holds the agent's batch slot so nothing is delivered before
+            # the messages already in its queue.
+            self._ensure_dispatcher()
+            self._track_batch(agent.agent_id, self._take_over_queue(agent))
+
         logger.info(f"Registered agent: {agent.agent_id}")
 
     def unregister_agent(self, agent_id: str):
         """Unregister an agent"""
         if agent_id in self.agents:
-            del self.agents[agent_id]
+            agent = self.agents.pop(agent_id)
+            agent._hub = None
+
+            # Messages still held here go back to the agent's own queue
+            for priority, _, message in self._take_backlog(agent_id):
+                try:
+                    agent.message_queue.put_nowait(
+                        (priority, next(agent._seq), message))
+                except asyncio.QueueFull:
+                    logger.warning(
+                        f"Dropping message {message.id} for {agent_id}: queue full")
+
+            if agent.is_running:
+                agent._start_message_processor(
+                    after=self._agent_batches.get(agent_id))
             logger.info(f"Unregistered agent: {agent_id}")
 
     async def _handle_message(self, message: AgentMessage):
         """Handle message routing between agents"""
-        # Store in history
+        # Store in history; the deque evicts the oldest entry when full
         self.message_history.append(message)
-        if len(self.message_history) > self.max_history:
-            self.message_history.pop(0)
 
         # Route to recipient
         if message.recipient == "broadcast":
             # Broadcast to all agents except sender
-            for agent_id, agent in self.agents.items():
-                if agent_id != message.sender:
-                    await agent.receive_message(message)
+            results = await asyncio.gather(
+                *(self._deliver(agent, message)
+                  for agent_id, agent in self.agents.items()
+                  if agent_id != message.sender),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error broadcasting message: {result}")
         elif message.recipient in self.agents:
             # Direct message to specific agent
-            await self.agents[message.recipient].receive_message(message)
+            await self._deliver(self.agents[message.recipient], message)
         else:
             logger.warning(f"Message recipient not found: {message.recipient}")
 
-    async def send_message(self, message: AgentMessage):
-        """Send message through the hub"""
-        await self._handle_message(message)
+    async def _deliver(self, agent: BaseAgent, message: AgentMessage):
+        """Queue message for an agent, shedding low-priority load when full"""
+        if message.priority < 2 and agent.queue_full():
+            logger.warning(
+                f"Dropping low-priority message {message.id} for {agent.agent_id}: queue full")
+            return
+
+        # Higher priorities wait for room, applying backpressure to the sender
+        await agent.receive_message(message)
+
+    async def _enqueue(self, agent: BaseAgent, message: AgentMessage):
+        """Queue a message for the central dispatcher, waiting for room"""
+        agent_id = agent.agent_id
+        while self._pending[agent_id] >= agent.max_queue_size:
+            if agent._hub is not self:
+                break
+            waiter = asyncio.get_running_loop().create_future()
+            self._room_waiters[agent_id].append(waiter)
+            await waiter
+
+        if agent._hub is not self:
+            # Unregistered while waiting; use the agent's own queue
+            await agent.receive_message(message)
+            return
+
+        self._pending[agent_id] += 1
+        self._central_queue.put_nowait(
+            (-message.priority, next(self._seq), agent_id, message))
+
+    def _wake_senders(self, agent_id: str):
+        """Let senders waiting for room in an agent's backlog re-check"""
+        for waiter in self._room_waiters.pop(agent_id, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _ensure_dispatcher(self):
+        """Start the central dispatcher if it is not running"""
+        if self._dispatcher_task is None or self._dispatcher_task.done():
+            self._dispatcher_task = asyncio.get_running_loop().create_task(
+                self._central_dispatcher(), context=contextvars.Context())
+
+    async def _central_dispatcher(self):
+        """Move queued messages to their agents and start batches"""
+        while True:
+            # Block for one message, then drain what is already queued
+            batch = [await self._central_queue.get()]
+            while len(batch) < self.dispatch_batch_size:
+                try:
+                    batch.append(self._central_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            ready = set()
+            for priority, seq, agent_id, message in batch:
+                heapq.heappush(self._waiting[agent_id], (priority, seq, message))
+                ready.add(agent_id)
+
+            for agent_id in ready:
+                self._start_batch(agent_id)
+
+    def _start_batch(self, agent_id: str):
+        """Hand an agent its next batch unless one is already in flight"""
+        waiting = self._waiting.get(agent_id)
+        if not waiting or agent_id in self._agent_batches:
+            return
+
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            # Recipient was unregistered after the message was queued
+            self._waiting.pop(agent_id, None)
+            self._pending.pop(agent_id, None)
+            return
+        if not agent.is_running:
+            # Held until start()
+            return
+
+        size = min(len(waiting), agent.message_batch_size)
+        messages = [heapq.heappop(waiting)[2] for _ in range(size)]
+        self._pending[agent_id] -= size
+        self._wake_senders(agent_id)
+        self._track_batch(agent_id, agent._process_batch(messages))
+
+    def _track_batch(self, agent_id: str, coro: Awaitable[None]):
+        """Run coro as the agent's in-flight batch"""
+        task = asyncio.get_running_loop().create_task(
+            coro, context=contextvars.Context())
+        self._agent_batches[agent_id] = task
+        task.add_done_callback(functools.partial(self._batch_done, agent_id))
+
+    def _batch_done(self, agent_id: str, task: asyncio.Task):
+        """Release the agent's batch slot and start its next batch"""
+        self._agent_batches.pop(agent_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                f"Error processing batch for {agent_id}: {task.exception()}")
+        self._start_batch(agent_id)
+
+    async def _take_over_queue(self, agent: BaseAgent):
+        """Stop an agent's own processor and move its queued messages here"""
+        await agent._stop_message_processor()
+        if agent._hub is not self:
+            # Unregistered meanwhile; its restarted processor keeps the queue
+            return
+
+        waiting = self._waiting[agent.agent_id]
+        while not agent.message_queue.empty():
+            priority, _, message = agent.message_queue.get_nowait()
+            heapq.heappush(waiting, (priority, next(self._seq), message))
+            self._pending[agent.agent_id] += 1
+
+    def _take_backlog(self, agent_id: str) -> List[Tuple[int, int, AgentMessage]]:
+        """Remove and return every message still held for an agent"""
+        backlog = self._waiting.pop(agent_id, [])
+        others = []
+        while not self._central_queue.empty():
+            entry = self._central_queue.get_nowait()
+            if entry[2] == agent_id:
+                backlog.append((entry[0], entry[1], entry[3]))
+            else:
+                others.append(entry)
+        for entry in others:
+            self._central_queue.put_nowait(entry)
+
+        self._pending.pop(agent_id, None)
+        self._wake_senders(agent_id)
+        backlog.sort()
+        return backlog
+
+    def send_message(self, message: AgentMessage) -> Awaitable[None]:
+        """Send message through the hub; returns the awaitable routing"""
+        return self._handle_message(message)
 
     def get_agent_statuses(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all registered agents"""
@@ -266,10 +590,17 @@ class AgentCommunicationHub:
 
     def get_message_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent message history"""
-        return [
-            message.to_dict()
-            for message in self.message_history[-limit:]
-        ]
+        return [message.as_dict for message in self._recent_messages(limit)]
+
+    def get_message_history_json(self, limit: int = 100) -> bytes:
+        """Get recent message history serialized to JSON bytes"""
+        return orjson.dumps(
+            [message.as_dict for message in self._recent_messages(limit)])
+
+    def _recent_messages(self, limit: int):
+        """Iterate over the last `limit` messages, oldest first"""
+        start = max(len(self.message_history) - limit, 0)
+        return itertools.islice(self.message_history, start, None)
 
     async def start_all_agents(self):
         """Start all registered agents"""
@@ -285,6 +616,15 @@ class AgentCommunicationHub:
         for agent in self.agents.values():
             await agent.stop()
 
+        # Cancel the dispatcher and any batches still being delivered
+        tasks = list(self._agent_batches.values())
+        if self._dispatcher_task is not None:
+            tasks.append(self._dispatcher_task)
+            self._dispatcher_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
         logger.info("All agents stopped")
 
 
@@ -301,10 +641,8 @@ def create_message(
     context: Optional[Dict[str, Any]] = None
 ) -> AgentMessage:
     """Utility function to create agent messages"""
-    import uuid
-
     return AgentMessage(
-        id=str(uuid.uuid4()),
+        id=f"{_pid}-{next(_msg_counter):x}",
         sender=sender,
         recipient=recipient,
         message_type=message_type,
@@ -4,18 +4,23 @@ File: backend/agents/executor.py
 """
 
 import asyncio
+import functools
 import logging
+import re
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Callable, ClassVar
+from dataclasses import dataclass, field
 from enum import Enum
-import json
 import uuid
 
+import orjson
+
 # LangGraph imports
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from typing_extensions import TypedDict, Annotated
+from langchain_core.runnables import RunnableConfig
+from typing_extensions import Annotated
 
 from .base_agent import BaseAgent, AgentType, AgentMessage, MessageType, create_message, communication_hub
 from .alert_agent import HealthAgent
@@ -26,6 +31,53 @@ from llm.openai_client import OpenAIClient
 
 logger = logging.getLogger(__name__)
 
+# Alert batching: alerts arriving within the window share one workflow run
+ALERT_BATCH_WINDOW_S = 0.05
+ALERT_BATCH_MAX_SIZE = 32
+# Per-alert entries of a batched alert workflow's results
+ALERT_BATCH_RESULT_KEYS = (
+    "alert_info", "analysis_result", "correlation_data", "final_response")
+
+# Constant query contents shared by every workflow run; agents only read
+# message content, and plain dicts keep messages orjson-serializable
+_Q_SYSTEM_OVERVIEW = {"type": "system_overview"}
+_Q_RECENT_ANALYSES = {"type": "recent_analyses"}
+
+# Overall health labels indexed by the code from _summarize_health
+HEALTH_LEVELS = ("healthy", "warning", "critical")
+
+# Recommendation keywords in priority order; group index selects the prefix
+_RECO_RE = re.compile(
+    r"^(?:(?=.*investigate)()|(?=.*degraded)()|(?=.*optimal)())",
+    re.IGNORECASE | re.DOTALL)
+RECOMMENDATION_PREFIXES = (
+    "Action needed", "Monitor closely", "Maintain current state")
+
+
+def _match_recommendations(items: List[str]) -> List[str]:
+    """Prefix each insight item by its highest-priority keyword, dropping the rest"""
+    recommendations = []
+    for item in items:
+        m = _RECO_RE.match(item)
+        if m:
+            prefix = RECOMMENDATION_PREFIXES[m.lastindex - 1]
+            recommendations.append(f"{prefix}: {item}")
+    return recommendations
+
+
+def _summarize_health(critical: int, warning: int) -> int:
+    """Return the overall health code (0 healthy, 1 warning, 2 critical)"""
+    if critical > 0:
+        return 2
+    return 1 if warning > 0 else 0
+
+
+def _health_band(health_percentage: float) -> int:
+    """Return -1 for degraded (<80%), 1 for optimal (>95%), otherwise 0"""
+    if health_percentage < 80:
+        return -1
+    return 1 if health_percentage > 95 else 0
+
 
 class WorkflowType(Enum):
     """Types of workflows supported"""
@@ -36,7 +88,7 @@ class WorkflowType(Enum):
     PROACTIVE_MONITORING = "proactive_monitoring"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WorkflowRequest:
     """Request for workflow execution"""
     request_id: str
@@ -47,7 +99,7 @@ class WorkflowRequest:
     callback: Optional[Callable] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WorkflowResult:
     """Result of workflow execution"""
     request_id: str
@@ -57,27 +109,81 @@ class WorkflowResult:
     execution_time: float
     error_message: Optional[str] = None
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize result to JSON bytes"""
+        return orjson.dumps({
+            "request_id": self.request_id,
+            "workflow_type": self.workflow_type.value,
+            "success": self.success,
+            "result": self.result,
+            "execution_time": self.execution_time,
+            "error_message": self.error_message
+        })
+
 # LangGraph State
 
 
-class AgentState(TypedDict):
-    """State for LangGraph workflow"""
-    messages: Annotated[List[AgentMessage], add_messages]
-    workflow_type: str
-    request_id: str
-    current_step: str
-    results: Dict[str, Any]
-    error: Optional[str]
-    metadata: Dict[str, Any]
+@dataclass(slots=True)
+class AgentState:
+    """State for LangGraph workflow.
+
+    Item access is forwarded to the attributes so nodes can keep using
+    ``state["results"]``-style lookups.
+    """
+    messages: Annotated[List[AgentMessage], add_messages] = field(
+        default_factory=list)
+    workflow_type: str = ""
+    request_id: str = ""
+    current_step: str = ""
+    results: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+def _executor_node(method_name: str) -> Callable:
+    """Wrap an executor node method so compiled graphs are instance-independent.
+
+    The executor running the workflow is passed in the invoke config. Any
+    exception raised by the node is recorded in ``state["error"]``, so node
+    bodies need no error handling of their own.
+    """
+    label = method_name.strip("_").removesuffix("_node").replace("_", " ")
+    label = label.capitalize()
+
+    async def node(state: AgentState, config: RunnableConfig) -> AgentState:
+        executor = config["configurable"]["executor"]
+        try:
+            return await getattr(executor, method_name)(state)
+        except Exception as e:
+            if isinstance(e, ExceptionGroup):
+                # Report the first failure of a node's TaskGroup
+                e = e.exceptions[0]
+            state["error"] = f"{label} failed: {str(e)}"
+            logger.error(f"{label} node error: {e}")
+            return state
+    return node
 
 
 class WatchTowerExecutor:
     """Main executor for WatchTower AI multi-agent system"""
 
+    # Compiled graphs shared by all executor instances, keyed by workflow type
+    _COMPILED_WORKFLOWS: ClassVar[Dict[str, Any]] = {}
+
     def __init__(self):
         self.is_running = False
         self.agents: Dict[str, BaseAgent] = {}
         self.workflows: Dict[str, StateGraph] = {}
+        # In-flight runs only; entries are removed when a run finishes
         self.active_workflows: Dict[str, Dict[str, Any]] = {}
 
         # Initialize components
@@ -85,6 +191,31 @@ class WatchTowerExecutor:
         self.dashboard_registry = DashboardRegistry()
         self.openai_client = OpenAIClient()
 
+        # The service registry is static after construction; cache its names
+        self._all_service_names: tuple = ()
+        self._refresh_service_names()
+
+        # Per-node message factories; only content varies per call
+        self._msg_templates: Dict[str, Callable[..., AgentMessage]] = {
+            "health_query": functools.partial(
+                create_message, sender="executor", recipient="health_agent",
+                message_type=MessageType.QUERY),
+            "analysis_alert": functools.partial(
+                create_message, sender="executor", recipient="analysis_agent",
+                message_type=MessageType.ALERT),
+            "analysis_query": functools.partial(
+                create_message, sender="executor", recipient="analysis_agent",
+                message_type=MessageType.QUERY),
+        }
+
+        # Passed to every workflow run so shared graphs call this instance
+        self._invoke_config = {"configurable": {"executor": self}}
+
+        # Alert batching; queue and batcher task are created on first use
+        self._alert_queue: Optional[asyncio.Queue] = None
+        self._alert_batcher_task: Optional[asyncio.Task] = None
+        self._alert_batch_tasks: set = set()
+
         # Performance tracking
         self.workflows_executed = 0
         self.start_time = datetime.now()
@@ -95,6 +226,11 @@ class WatchTowerExecutor:
 
         logger.info("WatchTower Executor initialized")
 
+    def _refresh_service_names(self):
+        """Re-read the service names from the registry"""
+        self._all_service_names = tuple(
+            self.service_registry.get_all_services())
+
     def _initialize_agents(self):
         """Initialize all agents"""
         try:
@@ -116,13 +252,30 @@ class WatchTowerExecutor:
     def _initialize_workflows(self):
         """Initialize LangGraph workflows"""
         try:
-            # Create workflows for different scenarios
-            self.workflows = {
-                WorkflowType.HEALTH_CHECK.value: self._create_health_check_workflow(),
-                WorkflowType.ALERT_ANALYSIS.value: self._create_alert_analysis_workflow(),
-                WorkflowType.SYSTEM_ANALYSIS.value: self._create_system_analysis_workflow(),
-                WorkflowType.CORRELATION_ANALYSIS.value: self._create_correlation_analysis_workflow(),
-                WorkflowType.PROACTIVE_MONITORING.value: self._create_proactive_monitoring_workflow()
+            # Create workflows for different scenarios, compiling only once
+            compiled = WatchTowerExecutor._COMPILED_WORKFLOWS
+            if not compiled:
+                compiled.update({
+                    WorkflowType.HEALTH_CHECK.value: self._create_health_check_workflow(),
+                    WorkflowType.ALERT_ANALYSIS.value: self._create_alert_analysis_workflow(),
+                    WorkflowType.SYSTEM_ANALYSIS.value: self._create_system_analysis_workflow(),
+                    WorkflowType.CORRELATION_ANALYSIS.value: self._create_correlation_analysis_workflow(),
+                    WorkflowType.PROACTIVE_MONITORING.value: self._create_proactive_monitoring_workflow()
+                })
+            self.workflows = dict(compiled)
+
+            # Constant initial-state fields per workflow; copied per execution
+            self._workflow_templates: Dict[str, Dict[str, Any]] = {
+                key: {
+                    "messages": [],
+                    "workflow_type": key,
+                    "request_id": "",
+                    "current_step": "started",
+                    "results": {},
+                    "error": None,
+                    "metadata": {}
+                }
+                for key in self.workflows
             }
 
             logger.info(f"Initialized {len(self.workflows)} workflows")
@@ -135,8 +288,9 @@ class WatchTowerExecutor:
         workflow = StateGraph(AgentState)
 
         # Add nodes
-        workflow.add_node("health_check", self._health_check_node)
-        workflow.add_node("process_results", self._process_health_results_node)
+        workflow.add_node("health_check", _executor_node("_health_check_node"))
+        workflow.add_node("process_results",
+                          _executor_node("_process_health_results_node"))
 
         # Add edges
         workflow.add_edge("health_check", "process_results")
@@ -152,15 +306,16 @@ class WatchTowerExecutor:
         workflow = StateGraph(AgentState)
 
         # Add nodes
-        workflow.add_node("receive_alert", self._receive_alert_node)
-        workflow.add_node("analyze_alert", self._analyze_alert_node)
-        workflow.add_node("correlate_services", self._correlate_services_node)
-        workflow.add_node("generate_response", self._generate_response_node)
+        workflow.add_node("receive_alert",
+                          _executor_node("_receive_alert_node"))
+        workflow.add_node("parallel_alert",
+                          _executor_node("_parallel_alert_node"))
+        workflow.add_node("generate_response",
+                          _executor_node("_generate_response_node"))
 
         # Add edges
-        workflow.add_edge("receive_alert", "analyze_alert")
-        workflow.add_edge("analyze_alert", "correlate_services")
-        workflow.add_edge("correlate_services", "generate_response")
+        workflow.add_edge("receive_alert", "parallel_alert")
+        workflow.add_edge("parallel_alert", "generate_response")
         workflow.add_edge("generate_response", END)
 
         # Set entry point
@@ -173,20 +328,20 @@ class WatchTowerExecutor:
         workflow = StateGraph(AgentState)
 
         # Add nodes
-        workflow.add_node("gather_metrics", self._gather_metrics_node)
-        workflow.add_node("analyze_patterns", self._analyze_patterns_node)
-        workflow.add_node("generate_insights", self._generate_insights_node)
+        workflow.add_node("parallel_gather",
+                          _executor_node("_parallel_gather_node"))
+        workflow.add_node("generate_insights",
+                          _executor_node("_generate_insights_node"))
         workflow.add_node("create_recommendations",
-                          self._create_recommendations_node)
+                          _executor_node("_create_recommendations_node"))
 
         # Add edges
-        workflow.add_edge("gather_metrics", "analyze_patterns")
-        workflow.add_edge("analyze_patterns", "generate_insights")
+        workflow.add_edge("parallel_gather", "generate_insights")
         workflow.add_edge("generate_insights", "create_recommendations")
         workflow.add_edge("create_recommendations", END)
 
         # Set entry point
-        workflow.set_entry_point("gather_metrics")
+        workflow.set_entry_point("parallel_gather")
 
         return workflow.compile()
 
@@ -195,10 +350,12 @@ class WatchTowerExecutor:
         workflow = StateGraph(AgentState)
 
         # Add nodes
-        workflow.add_node("identify_services", self._identify_services_node)
+        workflow.add_node("identify_services",
+                          _executor_node("_identify_services_node"))
         workflow.add_node("analyze_correlations",
-                          self._analyze_correlations_node)
-        workflow.add_node("evaluate_impact", self._evaluate_impact_node)
+                          _executor_node("_analyze_correlations_node"))
+        workflow.add_node("evaluate_impact",
+                          _executor_node("_evaluate_impact_node"))
 
         # Add edges
         workflow.add_edge("identify_services", "analyze_correlations")
@@ -214,342 +371,312 @@ class WatchTowerExecutor:
         """Create proactive monitoring workflow"""
         workflow = StateGraph(AgentState)
 
-        # Add nodes
-        workflow.add_node("monitor_health", self._monitor_health_node)
-        workflow.add_node("detect_anomalies", self._detect_anomalies_node)
-        workflow.add_node("predict_issues", self._predict_issues_node)
-        workflow.add_node("generate_alerts", self._generate_alerts_node)
+        # The monitoring steps only write constant results, so they run as
+        # a single fused node instead of four graph transitions
+        workflow.add_node("proactive",
+                          _executor_node("_proactive_fused_node"))
 
         # Add edges
-        workflow.add_edge("monitor_health", "detect_anomalies")
-        workflow.add_edge("detect_anomalies", "predict_issues")
-        workflow.add_edge("predict_issues", "generate_alerts")
-        workflow.add_edge("generate_alerts", END)
+        workflow.add_edge("proactive", END)
 
         # Set entry point
-        workflow.set_entry_point("monitor_health")
+        workflow.set_entry_point("proactive")
 
         return workflow.compile()
 
     # Workflow nodes implementation
     async def _health_check_node(self, state: AgentState) -> AgentState:
         """Health check workflow node"""
-        try:
-            # Send health check request to health agent
-            health_message = create_message(
-                sender="executor",
-                recipient="health_agent",
-                message_type=MessageType.QUERY,
-                content={"type": "system_overview"}
-            )
+        # Send health check request to health agent
+        health_message = self._msg_templates["health_query"](
+            content=_Q_SYSTEM_OVERVIEW)
 
-            # Get health agent response
-            health_agent = self.agents["health_agent"]
-            response = await health_agent.process_message(health_message)
-
-            if response:
-                state["results"]["health_data"] = response.content
-                state["current_step"] = "health_check_completed"
-            else:
-                state["error"] = "Failed to get health data"
+        # Get health agent response
+        health_agent = self.agents["health_agent"]
+        response = await health_agent.process_message(health_message)
 
-            return state
+        if response:
+            state["results"]["health_data"] = response.content
+            state["current_step"] = "health_check_completed"
+        else:
+            state["error"] = "Failed to get health data"
 
-        except Exception as e:
-            state["error"] = f"Health check failed: {str(e)}"
-            logger.error(f"Health check node error: {e}")
-            return state
+        return state
 
     async def _process_health_results_node(self, state: AgentState) -> AgentState:
         """Process health results node"""
-        try:
-            health_data = state["results"].get("health_data", {})
-
-            # Process and summarize health data
-            summary = {
-                "overall_health": "healthy",
-                "total_services": 0,
-                "healthy_services": 0,
-                "issues_detected": []
-            }
-
-            if "overview" in health_data:
-                overview = health_data["overview"]
-                summary["total_services"] = overview.get("total_services", 0)
-                summary["healthy_services"] = overview.get(
-                    "healthy_services", 0)
-
-                if overview.get("critical_services", 0) > 0:
-                    summary["overall_health"] = "critical"
-                    summary["issues_detected"].append(
-                        f"{overview['critical_services']} critical services")
-                elif overview.get("warning_services", 0) > 0:
-                    summary["overall_health"] = "warning"
-                    summary["issues_detected"].append(
-                        f"{overview['warning_services']} services with warnings")
+        health_data = state["results"].get("health_data", {})
+
+        # Process and summarize health data
+        summary = {
+            "overall_health": "healthy",
+            "total_services": 0,
+            "healthy_services": 0,
+            "issues_detected": []
+        }
 
-            state["results"]["health_summary"] = summary
-            state["current_step"] = "results_processed"
+        if "overview" in health_data:
+            overview = health_data["overview"]
+            summary["total_services"] = overview.get("total_services", 0)
+            summary["healthy_services"] = overview.get(
+                "healthy_services", 0)
+
+            critical = overview.get("critical_services", 0)
+            warning = overview.get("warning_services", 0)
+            level = _summarize_health(critical, warning)
+            summary["overall_health"] = HEALTH_LEVELS[level]
+            if level == 2:
+                summary["issues_detected"].append(
+                    f"{critical} critical services")
+            elif level == 1:
+                summary["issues_detected"].append(
+                    f"{warning} services with warnings")
+
+        state["results"]["health_summary"] = summary
+        state["current_step"] = "results_processed"
 
-            return state
+        return state
 
-        except Exception as e:
-            state["error"] = f"Processing health results failed: {str(e)}"
-            logger.error(f"Process health results node error: {e}")
-            return state
+    @staticmethod
+    def _extract_alert_info(alert_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Pick the fields of an alert that the workflow works with"""
+        return {
+            "service_name": alert_data.get("service_name"),
+            "severity": alert_data.get("severity"),
+            "message": alert_data.get("message"),
+            "timestamp": alert_data.get("timestamp")
+        }
 
     async def _receive_alert_node(self, state: AgentState) -> AgentState:
         """Receive alert workflow node"""
-        try:
-            # Extract alert information from state
-            alert_data = state["metadata"].get("alert_data", {})
-
-            state["results"]["alert_info"] = {
-                "service_name": alert_data.get("service_name"),
-                "severity": alert_data.get("severity"),
-                "message": alert_data.get("message"),
-                "timestamp": alert_data.get("timestamp")
-            }
-
-            state["current_step"] = "alert_received"
-            return state
-
-        except Exception as e:
-            state["error"] = f"Receive alert failed: {str(e)}"
-            logger.error(f"Receive alert node error: {e}")
-            return state
+        # Extract alert information from state; batched runs carry a list
+        metadata = state["metadata"]
+        if "alerts" in metadata:
+            state["results"]["alert_info"] = [
+                self._extract_alert_info(alert)
+                for alert in metadata["alerts"]
+            ]
+        else:
+            state["results"]["alert_info"] = self._extract_alert_info(
+                metadata.get("alert_data", {}))
+
+        state["current_step"] = "alert_received"
+        return state
 
-    async def _analyze_alert_node(self, state: AgentState) -> AgentState:
-        """Analyze alert workflow node"""
-        try:
-            alert_info = state["results"]["alert_info"]
+    async def _parallel_alert_node(self, state: AgentState) -> AgentState:
+        """Run alert analysis and service correlation concurrently"""
+        alert_info = state["results"]["alert_info"]
 
-            # Send analysis request to analysis agent
-            analysis_message = create_message(
-                sender="executor",
-                recipient="analysis_agent",
-                message_type=MessageType.ALERT,
+        if isinstance(alert_info, list):
+            # Batched run: one message per agent call covering every alert
+            metrics = state["metadata"].get("metrics", [])
+            analysis_message = self._msg_templates["analysis_alert"](
+                content={
+                    "alerts": [
+                        {"alert": info, "metric": metric}
+                        for info, metric in zip(alert_info, metrics)
+                    ],
+                    "return_results": True
+                }
+            )
+            correlation_message = self._msg_templates["analysis_query"](
+                content={
+                    "type": "correlation",
+                    "service_names": [
+                        info["service_name"] for info in alert_info]
+                }
+            )
+        else:
+            analysis_message = self._msg_templates["analysis_alert"](
                 content={
                     "alert": alert_info,
                     "metric": state["metadata"].get("metric_data", {})
                 }
             )
-
-            # Get analysis agent response
-            analysis_agent = self.agents["analysis_agent"]
-            response = await analysis_agent.process_message(analysis_message)
-
-            if response:
-                state["results"]["analysis_result"] = response.content
-                state["current_step"] = "alert_analyzed"
-            else:
-                state["error"] = "Failed to analyze alert"
-
-            return state
-
-        except Exception as e:
-            state["error"] = f"Analyze alert failed: {str(e)}"
-            logger.error(f"Analyze alert node error: {e}")
-            return state
-
-    async def _correlate_services_node(self, state: AgentState) -> AgentState:
-        """Correlate services workflow node"""
-        try:
-            alert_info = state["results"]["alert_info"]
-            service_name = alert_info["service_name"]
-
-            # Request correlation analysis
-            correlation_message = create_message(
-                sender="executor",
-                recipient="analysis_agent",
-                message_type=MessageType.QUERY,
+            correlation_message = self._msg_templates["analysis_query"](
                 content={
                     "type": "correlation",
-                    "service_name": service_name
+                    "service_name": alert_info["service_name"]
                 }
             )
-
-            analysis_agent = self.agents["analysis_agent"]
-            response = await analysis_agent.process_message(correlation_message)
-
-            if response:
-                state["results"]["correlation_data"] = response.content
-                state["current_step"] = "services_correlated"
+        batched = isinstance(alert_info, list)
+
+        analysis_agent = self.agents["analysis_agent"]
+        async with asyncio.TaskGroup() as tg:
+            analysis_task = tg.create_task(
+                analysis_agent.process_message(analysis_message))
+            corr_task = tg.create_task(
+                analysis_agent.process_message(correlation_message))
+        analysis_resp = analysis_task.result()
+        corr_resp = corr_task.result()
+
+        if batched:
+            count = len(alert_info)
+
+            # Correlations are optional, as for a single alert
+            correlations = corr_resp.content.get(
+                "batch_results") if corr_resp else None
+            if not isinstance(correlations, list) or len(correlations) != count:
+                correlations = [None] * count
+            state["results"]["correlation_data"] = [
+                correlation or {"correlations": []}
+                for correlation in correlations
+            ]
+
+            # None entries mark alerts whose analysis failed
+            analyses = analysis_resp.content.get(
+                "batch_results") if analysis_resp else None
+            if isinstance(analyses, list) and len(analyses) == count:
+                state["results"]["analysis_result"] = analyses
+                state["current_step"] = "alert_analyzed"
             else:
-                state["results"]["correlation_data"] = {"correlations": []}
-
-            return state
-
-        except Exception as e:
-            state["error"] = f"Correlate services failed: {str(e)}"
-            logger.error(f"Correlate services node error: {e}")
+                state["error"] = "Failed to analyze alert batch"
             return state
 
-    async def _generate_response_node(self, state: AgentState) -> AgentState:
-        """Generate response workflow node"""
-        try:
-            # Compile all results into a comprehensive response
-            alert_info = state["results"]["alert_info"]
-            analysis_result = state["results"].get("analysis_result", {})
-            correlation_data = state["results"].get("correlation_data", {})
-
-            # Generate comprehensive response
-            response = {
-                "alert_summary": f"Alert from {alert_info['service_name']}: {alert_info['message']}",
-                "analysis_findings": analysis_result.get("analysis_result", {}).get("findings", []),
-                "recommendations": analysis_result.get("analysis_result", {}).get("recommendations", []),
-                "affected_services": correlation_data.get("correlations", []),
-                "confidence": analysis_result.get("analysis_result", {}).get("confidence", 0.5),
-                "response_message": analysis_result.get("response_message", "Analysis completed")
-            }
-
-            state["results"]["final_response"] = response
-            state["current_step"] = "response_generated"
-
-            return state
+        if corr_resp:
+            state["results"]["correlation_data"] = corr_resp.content
+        else:
+            state["results"]["correlation_data"] = {"correlations": []}
 
-        except Exception as e:
-            state["error"] = f"Generate response failed: {str(e)}"
-            logger.error(f"Generate response node error: {e}")
-            return state
-
-    async def _gather_metrics_node(self, state: AgentState) -> AgentState:
-        """Gather metrics workflow node"""
-        try:
-            # Request health agent to gather comprehensive metrics
-            metrics_message = create_message(
-                sender="executor",
-                recipient="health_agent",
-                message_type=MessageType.QUERY,
-                content={"type": "system_overview"}
-            )
-
-            health_agent = self.agents["health_agent"]
-            response = await health_agent.process_message(metrics_message)
-
-            if response:
-                state["results"]["metrics_data"] = response.content
-                state["current_step"] = "metrics_gathered"
-            else:
-                state["error"] = "Failed to gather metrics"
-
-            return state
+        if analysis_resp:
+            state["results"]["analysis_result"] = analysis_resp.content
+            state["current_step"] = "alert_analyzed"
+        else:
+            state["error"] = "Failed to analyze alert"
 
-        except Exception as e:
-            state["error"] = f"Gather metrics failed: {str(e)}"
-            logger.error(f"Gather metrics node error: {e}")
-            return state
+        return state
 
-    async def _analyze_patterns_node(self, state: AgentState) -> AgentState:
-        """Analyze patterns workflow node"""
-        try:
-            # Request analysis agent to analyze patterns
-            patterns_message = create_message(
-                sender="executor",
-                recipient="analysis_agent",
-                message_type=MessageType.QUERY,
-                content={"type": "recent_analyses"}
-            )
+    async def _generate_response_node(self, state: AgentState) -> AgentState:
+        """Generate response workflow node"""
+        # Compile all results into a comprehensive response
+        alert_info = state["results"]["alert_info"]
+        analysis_result = state["results"].get("analysis_result", {})
+        correlation_data = state["results"].get("correlation_data", {})
+
+        if isinstance(alert_info, list):
+            # Failed alerts keep a None response
+            response = [
+                self._build_alert_response(info, analysis, correlation)
+                if analysis is not None else None
+                for info, analysis, correlation in zip(
+                    alert_info, analysis_result, correlation_data, strict=True)
+            ]
+        else:
+            response = self._build_alert_response(
+                alert_info, analysis_result, correlation_data)
+
+        state["results"]["final_response"] = response
+        state["current_step"] = "response_generated"
 
-            analysis_agent = self.agents["analysis_agent"]
-            response = await analysis_agent.process_message(patterns_message)
+        return state
 
-            if response:
-                state["results"]["pattern_analysis"] = response.content
-                state["current_step"] = "patterns_analyzed"
-            else:
-                state["results"]["pattern_analysis"] = {"analyses": []}
+    @staticmethod
+    def _build_alert_response(alert_info: Dict[str, Any], analysis_result: Dict[str, Any],
+                              correlation_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the final response for a single analyzed alert"""
+        return {
+            "alert_summary": f"Alert from {alert_info['service_name']}: {alert_info['message']}",
+            "analysis_findings": analysis_result.get("analysis_result", {}).get("findings", []),
+            "recommendations": analysis_result.get("analysis_result", {}).get("recommendations", []),
+            "affected_services": correlation_data.get("correlations", []),
+            "confidence": analysis_result.get("analysis_result", {}).get("confidence", 0.5),
+            "response_message": analysis_result.get("response_message", "Analysis completed")
+        }
 
-            return state
+    async def _parallel_gather_node(self, state: AgentState) -> AgentState:
+        """Gather metrics and recent analysis patterns concurrently"""
+        metrics_message = self._msg_templates["health_query"](
+            content=_Q_SYSTEM_OVERVIEW)
+        patterns_message = self._msg_templates["analysis_query"](
+            content=_Q_RECENT_ANALYSES)
+
+        async with asyncio.TaskGroup() as tg:
+            metrics_task = tg.create_task(
+                self.agents["health_agent"].process_message(metrics_message))
+            patterns_task = tg.create_task(
+                self.agents["analysis_agent"].process_message(
+                    patterns_message))
+        metrics_resp = metrics_task.result()
+        patterns_resp = patterns_task.result()
+
+        if patterns_resp:
+            state["results"]["pattern_analysis"] = patterns_resp.content
+        else:
+            state["results"]["pattern_analysis"] = {"analyses": []}
+
+        if metrics_resp:
+            state["results"]["metrics_data"] = metrics_resp.content
+            state["current_step"] = "patterns_analyzed"
+        else:
+            state["error"] = "Failed to gather metrics"
 
-        except Exception as e:
-            state["error"] = f"Analyze patterns failed: {str(e)}"
-            logger.error(f"Analyze patterns node error: {e}")
-            return state
+        return state
 
     async def _generate_insights_node(self, state: AgentState) -> AgentState:
         """Generate insights workflow node"""
-        try:
-            metrics_data = state["results"].get("metrics_data", {})
-            pattern_analysis = state["results"].get("pattern_analysis", {})
-
-            # Generate insights based on metrics and patterns
-            insights = {
-                "system_health_trends": "System health is stable",
-                "performance_insights": [],
-                "capacity_recommendations": [],
-                "security_observations": []
-            }
+        metrics_data = state["results"].get("metrics_data", {})
+        pattern_analysis = state["results"].get("pattern_analysis", {})
+
+        # Generate insights based on metrics and patterns
+        insights = {
+            "system_health_trends": "System health is stable",
+            "performance_insights": [],
+            "capacity_recommendations": [],
+            "security_observations": []
+        }
 
-            # Add insights based on metrics
-            if "overview" in metrics_data:
-                overview = metrics_data["overview"]
-                health_percentage = overview.get("health_percentage", 0)
-
-                if health_percentage < 80:
-                    insights["performance_insights"].append(
-                        f"System health at {health_percentage}% - investigate degraded services"
-                    )
-                elif health_percentage > 95:
-                    insights["performance_insights"].append(
-                        "System performing optimally"
-                    )
-
-            # Add insights based on patterns
-            analyses = pattern_analysis.get("analyses", [])
-            if len(analyses) > 3:
-                insights["security_observations"].append(
-                    f"High analysis activity detected - {len(analyses)} analyses in recent period"
+        # Add insights based on metrics
+        if "overview" in metrics_data:
+            overview = metrics_data["overview"]
+            health_percentage = overview.get("health_percentage", 0)
+            band = _health_band(health_percentage)
+
+            if band < 0:
+                insights["performance_insights"].append(
+                    f"System health at {health_percentage}% - investigate degraded services"
+                )
+            elif band > 0:
+                insights["performance_insights"].append(
+                    "System performing optimally"
                 )
 
-            state["results"]["insights"] = insights
-            state["current_step"] = "insights_generated"
+        # Add insights based on patterns
+        analysis_count = len(pattern_analysis.get("analyses", ()))
+        if analysis_count > 3:
+            insights["security_observations"].append(
+                f"High analysis activity detected - {analysis_count} analyses in recent period"
+            )
 
-            return state
+        state["results"]["insights"] = insights
+        state["current_step"] = "insights_generated"
 
-        except Exception as e:
-            state["error"] = f"Generate insights failed: {str(e)}"
-            logger.error(f"Generate insights node error: {e}")
-            return state
+        return state
 
     async def _create_recommendations_node(self, state: AgentState) -> AgentState:
         """Create recommendations workflow node"""
-        try:
-            insights = state["results"].get("insights", {})
-
-            # Generate recommendations based on insights
-            recommendations = []
+        insights = state["results"].get("insights", {})
 
-            for insight_category, insight_items in insights.items():
-                if isinstance(insight_items, list):
-                    for item in insight_items:
-                        if "investigate" in item.lower():
-                            recommendations.append(f"Action needed: {item}")
-                        elif "degraded" in item.lower():
-                            recommendations.append(f"Monitor closely: {item}")
-                        elif "optimal" in item.lower():
-                            recommendations.append(
-                                f"Maintain current state: {item}")
+        # Generate recommendations based on insights
+        recommendations = _match_recommendations([
+            item
+            for insight_items in insights.values()
+            if isinstance(insight_items, list)
+            for item in insight_items
+        ])
 
-            if not recommendations:
-                recommendations.append(
-                    "System appears stable - continue monitoring")
+        if not recommendations:
+            recommendations.append(
+                "System appears stable - continue monitoring")
 
-            state["results"]["recommendations"] = recommendations
-            state["current_step"] = "recommendations_created"
+        state["results"]["recommendations"] = recommendations
+        state["current_step"] = "recommendations_created"
 
-            return state
-
-        except Exception as e:
-            state["error"] = f"Create recommendations failed: {str(e)}"
-            logger.error(f"Create recommendations node error: {e}")
-            return state
+        return state
 
     # Additional workflow nodes (simplified for brevity)
     async def _identify_services_node(self, state: AgentState) -> AgentState:
         """Identify services workflow node"""
-        state["results"]["identified_services"] = list(
-            self.service_registry.get_all_services().keys())
+        state["results"]["identified_services"] = self._all_service_names
         state["current_step"] = "services_identified"
         return state
 
@@ -567,27 +694,13 @@ class WatchTowerExecutor:
         state["current_step"] = "impact_evaluated"
         return state
 
-    async def _monitor_health_node(self, state: AgentState) -> AgentState:
-        """Monitor health workflow node"""
-        state["results"]["health_status"] = {"status": "monitoring_active"}
-        state["current_step"] = "health_monitored"
-        return state
-
-    async def _detect_anomalies_node(self, state: AgentState) -> AgentState:
-        """Detect anomalies workflow node"""
-        state["results"]["anomalies"] = {"detected": False, "count": 0}
-        state["current_step"] = "anomalies_detected"
-        return state
-
-    async def _predict_issues_node(self, state: AgentState) -> AgentState:
-        """Predict issues workflow node"""
-        state["results"]["predictions"] = {"issues_predicted": False}
-        state["current_step"] = "issues_predicted"
-        return state
-
-    async def _generate_alerts_node(self, state: AgentState) -> AgentState:
-        """Generate alerts workflow node"""
-        state["results"]["alerts_generated"] = {"count": 0}
+    async def _proactive_fused_node(self, state: AgentState) -> AgentState:
+        """Monitor health, detect anomalies, predict issues and generate alerts"""
+        results = state["results"]
+        results["health_status"] = {"status": "monitoring_active"}
+        results["anomalies"] = {"detected": False, "count": 0}
+        results["predictions"] = {"issues_predicted": False}
+        results["alerts_generated"] = {"count": 0}
         state["current_step"] = "alerts_generated"
         return state
 
@@ -611,6 +724,18 @@ class WatchTowerExecutor:
         self.is_running = False
         logger.info("Stopping WatchTower Executor...")
 
+        # Stop alert batching; alerts still queued are failed, not dropped
+        if self._alert_batcher_task:
+            self._alert_batcher_task.cancel()
+            await asyncio.gather(self._alert_batcher_task,
+                                 *self._alert_batch_tasks,
+                                 return_exceptions=True)
+            self._alert_batcher_task = None
+        if self._alert_queue:
+            while not self._alert_queue.empty():
+                self._fail_unprocessed_alerts(
+                    [self._alert_queue.get_nowait()])
+
         # Stop all agents
         await communication_hub.stop_all_agents()
 
@@ -618,9 +743,8 @@ class WatchTowerExecutor:
 
     async def execute_workflow(self, request: WorkflowRequest) -> WorkflowResult:
         """Execute a workflow"""
+        start_time = time.perf_counter()
         try:
-            start_time = datetime.now()
-
             # Get workflow
             workflow_key = request.workflow_type.value
             if workflow_key not in self.workflows:
@@ -635,22 +759,25 @@ class WatchTowerExecutor:
 
             workflow = self.workflows[workflow_key]
 
-            # Create initial state
-            initial_state = AgentState(
-                messages=[],
-                workflow_type=workflow_key,
-                request_id=request.request_id,
-                current_step="started",
-                results={},
-                error=None,
-                metadata=request.parameters
-            )
+            # Create initial state from the cached template; mutable fields
+            # are replaced so executions never share containers
+            initial_state = self._workflow_templates[workflow_key].copy()
+            initial_state["messages"] = []
+            initial_state["results"] = {}
+            initial_state["request_id"] = request.request_id
+            initial_state["metadata"] = request.parameters
 
             # Execute workflow
-            final_state = await workflow.ainvoke(initial_state)
+            self.active_workflows[request.request_id] = {
+                "workflow_type": workflow_key,
+                "started_at": datetime.now().isoformat()
+            }
+            final_state = await asyncio.wait_for(
+                workflow.ainvoke(initial_state, config=self._invoke_config),
+                timeout=request.timeout)
 
             # Calculate execution time
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
 
             # Create result
             result = WorkflowResult(
@@ -669,8 +796,23 @@ class WatchTowerExecutor:
 
             return result
 
+        except asyncio.TimeoutError:
+            execution_time = time.perf_counter() - start_time
+
+            logger.error(
+                f"Workflow {request.workflow_type.value} timed out after {request.timeout}s")
+
+            return WorkflowResult(
+                request_id=request.request_id,
+                workflow_type=request.workflow_type,
+                success=False,
+                result={},
+                execution_time=execution_time,
+                error_message=f"Workflow timed out after {request.timeout}s"
+            )
+
         except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
 
             logger.error(f"Workflow execution failed: {e}")
 
@@ -683,24 +825,126 @@ class WatchTowerExecutor:
                 error_message=str(e)
             )
 
+        finally:
+            self.active_workflows.pop(request.request_id, None)
+
     async def process_alert(self, alert_data: Dict[str, Any], metric_data: Dict[str, Any]) -> WorkflowResult:
-        """Process an alert using the alert analysis workflow"""
-        request = WorkflowRequest(
-            request_id=str(uuid.uuid4()),
-            workflow_type=WorkflowType.ALERT_ANALYSIS,
-            parameters={
-                "alert_data": alert_data,
-                "metric_data": metric_data
-            },
-            priority=3
-        )
+        """Process an alert using the alert analysis workflow.
+
+        Alerts arriving within ALERT_BATCH_WINDOW_S of each other are
+        analyzed by a single workflow run; each caller gets its own result.
+        """
+        self._ensure_alert_batcher()
+        future = asyncio.get_running_loop().create_future()
+        self._alert_queue.put_nowait((alert_data, metric_data, future))
+        return await future
+
+    def _ensure_alert_batcher(self):
+        """Start the alert batcher task if it is not running"""
+        if self._alert_queue is None:
+            self._alert_queue = asyncio.Queue()
+        if self._alert_batcher_task is None or self._alert_batcher_task.done():
+            self._alert_batcher_task = asyncio.create_task(
+                self._alert_batcher())
+
+    async def _alert_batcher(self):
+        """Collect queued alerts into batches and run each batch"""
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._alert_queue.get()]
+                deadline = loop.time() + ALERT_BATCH_WINDOW_S
+
+                while len(batch) < ALERT_BATCH_MAX_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(
+                            self._alert_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Run batches concurrently; a slow batch doesn't hold the next
+                task = asyncio.create_task(self._run_alert_batch(batch))
+                self._alert_batch_tasks.add(task)
+                task.add_done_callback(self._alert_batch_tasks.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Alerts collected for a batch that never started
+            self._fail_unprocessed_alerts(batch)
+            raise
+
+    @staticmethod
+    def _fail_unprocessed_alerts(entries: List[tuple]):
+        """Fail the callers of alerts that will not be processed"""
+        for _, _, future in entries:
+            if not future.done():
+                future.set_exception(
+                    RuntimeError("Executor stopped before alert was processed"))
+
+    async def _run_alert_batch(self, batch: List[tuple]):
+        """Run one alert workflow for a batch and resolve each caller's future"""
+        try:
+            if len(batch) == 1:
+                alert_data, metric_data, future = batch[0]
+                result = await self.execute_workflow(WorkflowRequest(
+                    request_id=uuid.uuid4().hex,
+                    workflow_type=WorkflowType.ALERT_ANALYSIS,
+                    parameters={
+                        "alert_data": alert_data,
+                        "metric_data": metric_data
+                    },
+                    priority=3
+                ))
+                if not future.done():
+                    future.set_result(result)
+                return
+
+            batch_result = await self.execute_workflow(WorkflowRequest(
+                request_id=uuid.uuid4().hex,
+                workflow_type=WorkflowType.ALERT_ANALYSIS,
+                parameters={
+                    "alerts": [alert_data for alert_data, _, _ in batch],
+                    "metrics": [metric_data for _, metric_data, _ in batch]
+                },
+                priority=3
+            ))
+
+            for index, (_, _, future) in enumerate(batch):
+                if future.done():
+                    continue
+                per_alert = {}
+                for key in ALERT_BATCH_RESULT_KEYS:
+                    values = batch_result.result.get(key)
+                    if (isinstance(values, list) and index < len(values)
+                            and values[index] is not None):
+                        per_alert[key] = values[index]
+
+                # An alert without a response failed on its own
+                error_message = batch_result.error_message
+                if error_message is None and "final_response" not in per_alert:
+                    error_message = "Failed to analyze alert"
+                future.set_result(WorkflowResult(
+                    request_id=f"{batch_result.request_id}-{index}",
+                    workflow_type=batch_result.workflow_type,
+                    success=error_message is None,
+                    result=per_alert,
+                    execution_time=batch_result.execution_time,
+                    error_message=error_message
+                ))
 
-        return await self.execute_workflow(request)
+        except Exception as e:
+            logger.error(f"Alert batch processing failed: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
 
     async def perform_health_check(self) -> WorkflowResult:
         """Perform system health check"""
         request = WorkflowRequest(
-            request_id=str(uuid.uuid4()),
+            request_id=uuid.uuid4().hex,
             workflow_type=WorkflowType.HEALTH_CHECK,
             parameters={},
             priority=2
@@ -711,7 +955,7 @@ class WatchTowerExecutor:
     async def analyze_system(self) -> WorkflowResult:
         """Perform comprehensive system analysis"""
         request = WorkflowRequest(
-            request_id=str(uuid.uuid4()),
+            request_id=uuid.uuid4().hex,
             workflow_type=WorkflowType.SYSTEM_ANALYSIS,
             parameters={},
             priority=1
@@ -734,5 +978,7 @@ class WatchTowerExecutor:
         }
 
 
-# Global executor instance
-executor = WatchTowerExecutor()
+@functools.cache
+def get_executor() -> WatchTowerExecutor:
+    """Return the global executor, creating it on first use"""
+    return WatchTowerExecutor()
@@ -5,24 +5,84 @@ File: backend/agents/integration.py
 
 import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import re
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Set, Tuple
 from contextlib import asynccontextmanager
 
-from .executor import executor, WorkflowType, WorkflowRequest
+from .executor import get_executor, WorkflowType, WorkflowRequest
 from .base_agent import communication_hub
 
 logger = logging.getLogger(__name__)
 
+# Proactive monitoring cadence and the retry delay after a failed cycle
+PROACTIVE_MONITORING_INTERVAL_S = 300.0
+PROACTIVE_MONITORING_RETRY_S = 60.0
+
+# How long a successful workflow result is reused for chat queries
+RESULT_CACHE_TTL_S = 5.0
+# How long an assembled system status snapshot is served to pollers
+STATUS_CACHE_TTL_S = 1.0
+
+# Health percentage thresholds (exclusive lower bounds) and their emoji
+HEALTH_EMOJI_THRESHOLDS = ((90, "✅"), (70, "⚠️"))
+HEALTH_EMOJI_CRITICAL = "🚨"
+
+# Chat query routing keywords in priority order (health > analysis > overview)
+ROUTE_KEYWORDS = {
+    "health": ("health", "status", "how are"),
+    "analysis": ("analyze", "analysis", "why", "problem"),
+    "overview": ("overview", "summary", "report")
+}
+
+# One compiled pattern for all routes; the matched group names the handler,
+# regardless of where the keyword appears in the query
+_ROUTE_RE = re.compile(
+    "^(?:" + "|".join(
+        f"(?=.*(?:{'|'.join(map(re.escape, keywords))}))(?P<{route}>)"
+        for route, keywords in ROUTE_KEYWORDS.items()
+    ) + ")",
+    re.IGNORECASE | re.DOTALL)
+
+
+def _status_emoji(health_percentage: float) -> str:
+    """Emoji for a system health percentage"""
+    for threshold, emoji in HEALTH_EMOJI_THRESHOLDS:
+        if health_percentage > threshold:
+            return emoji
+    return HEALTH_EMOJI_CRITICAL
+
 
 class AgentIntegration:
     """Integration layer for WatchTower AI agents"""
 
-    def __init__(self):
+    __slots__ = (
+        "is_initialized", "background_tasks", "monitoring_active",
+        "result_ttl", "_result_cache", "_result_locks", "_status_cache",
+        "_query_handlers"
+    )
+
+    def __init__(self, result_ttl: float = RESULT_CACHE_TTL_S):
         self.is_initialized = False
-        self.background_tasks = []
+        # Running tasks only; each removes itself when it finishes
+        self.background_tasks: Set[asyncio.Task] = set()
         self.monitoring_active = False
 
+        # Short-lived workflow results shared by bursts of chat queries
+        self.result_ttl = result_ttl
+        self._result_cache: Dict[str, Tuple[float, Any]] = {}
+        self._result_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+        # (monotonic time built, snapshot) for get_system_status
+        self._status_cache: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
+        self._query_handlers = {
+            "health": self._handle_health_query,
+            "analysis": self._handle_analysis_query,
+            "overview": self._handle_overview_query,
+            "general": self._handle_general_query
+        }
+
     async def initialize(self):
         """Initialize the agent system"""
         if self.is_initialized:
@@ -33,12 +93,13 @@ class AgentIntegration:
             logger.info("Initializing WatchTower AI Agent System...")
 
             # Start the executor
-            await executor.start()
+            await get_executor().start()
 
             # Start background monitoring
             await self._start_background_monitoring()
 
             self.is_initialized = True
+            self._status_cache = (0.0, None)
             logger.info("✅ Agent system initialized successfully")
 
         except Exception as e:
@@ -56,7 +117,9 @@ class AgentIntegration:
         await self._stop_background_monitoring()
 
         # Stop executor
-        await executor.stop()
+        await get_executor().stop()
+        self._result_cache.clear()
+        self._status_cache = (0.0, None)
 
         self.is_initialized = False
         logger.info("Agent system shutdown complete")
@@ -69,7 +132,8 @@ class AgentIntegration:
             # Create background task for proactive monitoring
             monitoring_task = asyncio.create_task(
                 self._proactive_monitoring_loop())
-            self.background_tasks.append(monitoring_task)
+            self.background_tasks.add(monitoring_task)
+            monitoring_task.add_done_callback(self.background_tasks.discard)
 
             logger.info("Background monitoring started")
 
@@ -80,43 +144,48 @@ class AgentIntegration:
         """Stop background monitoring tasks"""
         self.monitoring_active = False
 
-        # Cancel all background tasks
-        for task in self.background_tasks:
+        # Cancel all background tasks; done callbacks shrink the set
+        tasks = list(self.background_tasks)
+        for task in tasks:
             task.cancel()
 
         # Wait for tasks to complete
-        if self.background_tasks:
-            await asyncio.gather(*self.background_tasks, return_exceptions=True)
-
-        self.background_tasks.clear()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
         logger.info("Background monitoring stopped")
 
     async def _proactive_monitoring_loop(self):
         """Main proactive monitoring loop"""
+        # Sleep until a fixed deadline so run time doesn't stretch the period
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
         while self.monitoring_active:
             try:
                 # Run proactive monitoring workflow every 5 minutes
+                deadline += PROACTIVE_MONITORING_INTERVAL_S
                 await self._run_proactive_monitoring()
-                await asyncio.sleep(300)  # 5 minutes
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
 
             except asyncio.CancelledError:
                 logger.info("Proactive monitoring loop cancelled")
                 break
             except Exception as e:
                 logger.error(f"Error in proactive monitoring loop: {e}")
-                await asyncio.sleep(60)  # Wait 1 minute before retrying
+                # Wait before retrying, then restart the schedule from there
+                await asyncio.sleep(PROACTIVE_MONITORING_RETRY_S)
+                deadline = loop.time()
 
     async def _run_proactive_monitoring(self):
         """Run proactive monitoring workflow"""
         try:
             request = WorkflowRequest(
-                request_id=f"proactive_{int(datetime.now().timestamp())}",
+                request_id=f"proactive_{int(time.time())}",
                 workflow_type=WorkflowType.PROACTIVE_MONITORING,
                 parameters={},
                 priority=1
             )
 
-            result = await executor.execute_workflow(request)
+            result = await get_executor().execute_workflow(request)
 
             if result.success:
                 logger.debug("Proactive monitoring completed successfully")
@@ -127,6 +196,34 @@ class AgentIntegration:
         except Exception as e:
             logger.error(f"Error running proactive monitoring: {e}")
 
+    async def _cached(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a recent successful result for key, or run factory once.
+
+        Concurrent callers for the same key wait on one run instead of each
+        starting their own workflow.
+        """
+        entry = self._result_cache.get(key)
+        if entry and time.monotonic() - entry[0] < self.result_ttl:
+            return entry[1]
+
+        async with self._result_locks[key]:
+            entry = self._result_cache.get(key)
+            if entry and time.monotonic() - entry[0] < self.result_ttl:
+                return entry[1]
+
+            result = await factory()
+            if result.success:
+                self._result_cache[key] = (time.monotonic(), result)
+            return result
+
+    def _health_check(self) -> Awaitable[Any]:
+        """Health check workflow result, shared within the cache TTL"""
+        return self._cached("health_check", get_executor().perform_health_check)
+
+    def _system_analysis(self) -> Awaitable[Any]:
+        """System analysis workflow result, shared within the cache TTL"""
+        return self._cached("system_analysis", get_executor().analyze_system)
+
     # Public API methods for integration with chat system
     async def process_chat_query(self, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Process chat query using agent system"""
@@ -135,14 +232,9 @@ class AgentIntegration:
 
         try:
             # Determine query type and route to appropriate workflow
-            if any(word in query.lower() for word in ["health", "status", "how are"]):
-                return await self._handle_health_query(query, context)
-            elif any(word in query.lower() for word in ["analyze", "analysis", "why", "problem"]):
-                return await self._handle_analysis_query(query, context)
-            elif any(word in query.lower() for word in ["overview", "summary", "report"]):
-                return await self._handle_overview_query(query, context)
-            else:
-                return await self._handle_general_query(query, context)
+            m = _ROUTE_RE.match(query)
+            route = m.lastgroup if m else "general"
+            return await self._query_handlers[route](query, context)
 
         except Exception as e:
             logger.error(f"Error processing chat query: {e}")
@@ -151,7 +243,7 @@ class AgentIntegration:
     async def _handle_health_query(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Handle health-related queries"""
         try:
-            result = await executor.perform_health_check()
+            result = await self._health_check()
 
             if result.success:
                 health_data = result.result
@@ -178,7 +270,7 @@ class AgentIntegration:
     async def _handle_analysis_query(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Handle analysis-related queries"""
         try:
-            result = await executor.analyze_system()
+            result = await self._system_analysis()
 
             if result.success:
                 analysis_data = result.result
@@ -204,23 +296,37 @@ class AgentIntegration:
     async def _handle_overview_query(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Handle overview-related queries"""
         try:
-            # Get both health and analysis data
-            health_result = await executor.perform_health_check()
-            analysis_result = await executor.analyze_system()
+            # Health and analysis workflows are independent; run them together
+            executor = get_executor()
+            health_result, analysis_result = await asyncio.gather(
+                self._health_check(),
+                self._system_analysis(),
+                return_exceptions=True
+            )
+
+            for result in (health_result, analysis_result):
+                if isinstance(result, Exception):
+                    logger.error(f"Overview workflow failed: {result}")
+            health_ok = not isinstance(
+                health_result, Exception) and health_result.success
+            analysis_ok = not isinstance(
+                analysis_result, Exception) and analysis_result.success
 
             overview_data = {
-                "health_data": health_result.result if health_result.success else {},
-                "analysis_data": analysis_result.result if analysis_result.success else {},
+                "health_data": health_result.result if health_ok else {},
+                "analysis_data": analysis_result.result if analysis_ok else {},
                 "agent_status": executor.get_status()
             }
 
+            # The workflows overlap, so the wall-clock time is the longer one
             return {
                 "response_type": "system_overview",
                 "success": True,
                 "data": overview_data,
                 "summary": self._format_overview_summary(overview_data),
-                "execution_time": (health_result.execution_time if health_result.success else 0) +
-                                 (analysis_result.execution_time if analysis_result.success else 0)
+                "execution_time": max(
+                    health_result.execution_time if health_ok else 0,
+                    analysis_result.execution_time if analysis_ok else 0)
             }
 
         except Exception as e:
@@ -231,7 +337,7 @@ class AgentIntegration:
         """Handle general queries"""
         try:
             # For general queries, perform a basic health check
-            result = await executor.perform_health_check()
+            result = await self._health_check()
 
             return {
                 "response_type": "general",
@@ -257,15 +363,18 @@ class AgentIntegration:
             healthy_services = health_summary.get("healthy_services", 0)
             health_percentage = health_summary.get("health_percentage", 0)
 
-            status_emoji = "✅" if health_percentage > 90 else "⚠️" if health_percentage > 70 else "🚨"
+            status_emoji = _status_emoji(health_percentage)
 
-            summary = f"{status_emoji} **System Health: {health_percentage:.1f}%**\n"
-            summary += f"• {healthy_services}/{total_services} services healthy\n"
+            parts = [
+                f"{status_emoji} **System Health: {health_percentage:.1f}%**\n",
+                f"• {healthy_services}/{total_services} services healthy\n"
+            ]
 
             if health_summary.get("issues_detected"):
-                summary += f"• Issues: {', '.join(health_summary['issues_detected'])}\n"
+                parts.append(
+                    f"• Issues: {', '.join(health_summary['issues_detected'])}\n")
 
-            return summary
+            return "".join(parts)
 
         except Exception as e:
             logger.error(f"Error formatting health summary: {e}")
@@ -277,25 +386,29 @@ class AgentIntegration:
             insights = analysis_data.get("insights", {})
             recommendations = analysis_data.get("recommendations", [])
 
-            summary = "🔍 **System Analysis Complete**\n\n"
+            parts = ["🔍 **System Analysis Complete**\n\n"]
 
             # Add insights
             if insights:
-                summary += "**Key Insights:**\n"
+                parts.append("**Key Insights:**\n")
                 for category, items in insights.items():
                     if isinstance(items, list) and items:
-                        summary += f"• {category.replace('_', ' ').title()}: {items[0]}\n"
+                        first = items[0]
                     elif isinstance(items, str):
-                        summary += f"• {category.replace('_', ' ').title()}: {items}\n"
-                summary += "\n"
+                        first = items
+                    else:
+                        continue
+                    title = category.replace('_', ' ').title()
+                    parts.append(f"• {title}: {first}\n")
+                parts.append("\n")
 
             # Add recommendations
             if recommendations:
-                summary += "**Recommendations:**\n"
-                for rec in recommendations[:3]:  # Show first 3 recommendations
-                    summary += f"• {rec}\n"
+                parts.append("**Recommendations:**\n")
+                # Show first 3 recommendations
+                parts.extend(f"• {rec}\n" for rec in recommendations[:3])
 
-            return summary
+            return "".join(parts)
 
         except Exception as e:
             logger.error(f"Error formatting analysis summary: {e}")
@@ -307,26 +420,28 @@ class AgentIntegration:
             health_data = overview_data.get("health_data", {})
             agent_status = overview_data.get("agent_status", {})
 
-            summary = "📊 **System Overview**\n\n"
+            parts = ["📊 **System Overview**\n\n"]
 
             # Add health information
             if health_data and "health_summary" in health_data:
                 health_summary = health_data["health_summary"]
                 health_percentage = health_summary.get("health_percentage", 0)
 
-                status_emoji = "✅" if health_percentage > 90 else "⚠️" if health_percentage > 70 else "🚨"
-                summary += f"{status_emoji} **Health:** {health_percentage:.1f}%\n"
+                status_emoji = _status_emoji(health_percentage)
+                parts.append(
+                    f"{status_emoji} **Health:** {health_percentage:.1f}%\n")
 
             # Add agent status
             if agent_status:
                 workflows_executed = agent_status.get("workflows_executed", 0)
                 uptime = agent_status.get("uptime_seconds", 0)
 
-                summary += f"🤖 **AI Agents:** {agent_status.get('registered_agents', 0)} active\n"
-                summary += f"⚡ **Workflows:** {workflows_executed} executed\n"
-                summary += f"⏱️ **Uptime:** {uptime/3600:.1f} hours\n"
+                parts.append(
+                    f"🤖 **AI Agents:** {agent_status.get('registered_agents', 0)} active\n")
+                parts.append(f"⚡ **Workflows:** {workflows_executed} executed\n")
+                parts.append(f"⏱️ **Uptime:** {uptime/3600:.1f} hours\n")
 
-            return summary
+            return "".join(parts)
 
         except Exception as e:
             logger.error(f"Error formatting overview summary: {e}")
@@ -339,7 +454,7 @@ class AgentIntegration:
             return {"error": "Agent system not initialized"}
 
         try:
-            result = await executor.process_alert(alert_data, metric_data or {})
+            result = await get_executor().process_alert(alert_data, metric_data or {})
 
             if result.success:
                 return {
@@ -358,14 +473,21 @@ class AgentIntegration:
             return {"error": f"Alert processing failed: {str(e)}"}
 
     def get_system_status(self) -> Dict[str, Any]:
-        """Get comprehensive system status"""
-        return {
+        """Get comprehensive system status, reusing a snapshot for a second"""
+        now = time.monotonic()
+        built_at, snapshot = self._status_cache
+        if snapshot is not None and now - built_at < STATUS_CACHE_TTL_S:
+            return snapshot
+
+        snapshot = {
             "initialized": self.is_initialized,
             "monitoring_active": self.monitoring_active,
             "background_tasks": len(self.background_tasks),
-            "executor_status": executor.get_status() if self.is_initialized else {},
+            "executor_status": get_executor().get_status() if self.is_initialized else {},
             "agent_statuses": communication_hub.get_agent_statuses() if self.is_initialized else {}
         }
+        self._status_cache = (now, snapshot)
+        return snapshot
 
 
 # Global integration instance
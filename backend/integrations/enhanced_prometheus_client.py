@@ -4,6 +4,7 @@ from typing import Dict, List, Optional, Union, Any, Tuple
 from datetime import datetime, timedelta
 import json
 import logging
+import orjson
 from dataclasses import dataclass
 from enum import Enum
 import time
@@ -15,6 +16,9 @@ from models.service_models import ServiceCategory, ServiceInfo
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Response bodies larger than this are decoded off the event loop
+_OFFLOAD_DECODE_BYTES = 256 * 1024
+
 
 class MetricType(Enum):
     """Types of metrics for different analysis"""
@@ -71,6 +75,8 @@ class EnhancedPrometheusClient:
 
         # Connection settings
         self._timeout = aiohttp.ClientTimeout(total=30)
+        # Instant queries are small; bound their tail latency separately
+        self._query_timeout = aiohttp.ClientTimeout(total=2)
         self._retry_attempts = 3
         self._retry_delay = 1.0
 
@@ -80,14 +86,15 @@ class EnhancedPrometheusClient:
         logger.info("Enhanced Prometheus client initialized")
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session with proper configuration"""
+        """Get or create the shared keep-alive aiohttp session"""
         if self.session is None or self.session.closed:
             connector = aiohttp.TCPConnector(
                 limit=100,  # Connection pool limit
                 limit_per_host=20,
                 ttl_dns_cache=300,
                 use_dns_cache=True,
-                keepalive_timeout=60
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
             )
             self.session = aiohttp.ClientSession(
                 connector=connector,
@@ -96,6 +103,14 @@ class EnhancedPrometheusClient:
             )
         return self.session
 
+    async def _decode_response(self, response: aiohttp.ClientResponse) -> Any:
+        """Decode a JSON response body with orjson, offloading large payloads"""
+        raw = await response.read()
+        if len(raw) > _OFFLOAD_DECODE_BYTES:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, orjson.loads, raw)
+        return orjson.loads(raw)
+
     def _initialize_metric_templates(self) -> Dict[str, List[MetricTemplate]]:
         """Initialize service-specific metric templates for banking system - FINAL CORRECTED VERSION"""
         templates = {
@@ -360,6 +375,28 @@ class EnhancedPrometheusClient:
                 "execution_time_ms": result.execution_time_ms
             }
 
+    async def query_many(self, queries: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Run several named queries concurrently over the shared keep-alive session"""
+        names = list(queries)
+        results = await asyncio.gather(
+            *(self.query_metric(queries[name]) for name in names),
+            return_exceptions=True
+        )
+
+        batch = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                batch[name] = {
+                    "status": "error",
+                    "error": str(result),
+                    "timestamp": datetime.now().isoformat(),
+                    "execution_time_ms": 0.0
+                }
+            else:
+                batch[name] = result
+
+        return batch
+
     async def query_metric_with_retry(self, query: str) -> QueryResult:
         """Query Prometheus with retry logic and enhanced error handling"""
         start_time = time.time()
@@ -387,11 +424,11 @@ class EnhancedPrometheusClient:
                 url = f"{self.base_url}/api/v1/query"
                 params = {"query": query}
 
-                async with session.get(url, params=params) as response:
+                async with session.get(url, params=params, timeout=self._query_timeout) as response:
                     execution_time = (time.time() - start_time) * 1000
 
                     if response.status == 200:
-                        data = await response.json()
+                        data = await self._decode_response(response)
                         timestamp = datetime.now()
 
                         # Cache successful results
@@ -694,7 +731,7 @@ class EnhancedPrometheusClient:
             
             async with session.get(url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await self._decode_response(response)
                     return data.get("status") == "success"
                 return False
         except Exception as e:
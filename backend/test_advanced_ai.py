@@ -3,7 +3,7 @@ Test script for Advanced AI Features
 File: backend/test_advanced_ai.py
 """
 
-from agents.executor import executor, WorkflowType
+from agents.executor import get_executor, WorkflowType
 from agents.integration import agent_integration
 import asyncio
 import sys
@@ -16,6 +16,8 @@ sys.path.append(str(Path(__file__).parent))
 async def test_advanced_ai_features():
     """Test the advanced AI features"""
 
+    executor = get_executor()
+
     print("🧪 Testing WatchTower AI Advanced Features...")
     print("="*60)
 
@@ -0,0 +1,174 @@
+"""
+Test alert batching in the workflow executor
+File: backend/tests/test_alert_batching.py
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agents.base_agent import MessageType, communication_hub, create_message  # noqa: E402
+from agents.executor import WatchTowerExecutor  # noqa: E402
+from core.config import settings  # noqa: E402
+
+
+# Services whose analysis the stub agent fails
+FAILING_SERVICES = {"service-fail"}
+
+
+class StubAnalysisAgent:
+    """Answers analysis and correlation messages from the alert itself"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.messages = []
+
+    @staticmethod
+    def _analysis(alert):
+        service = alert["service_name"]
+        if service in FAILING_SERVICES:
+            return None
+        return {
+            "analysis_result": {"findings": [f"{service} finding"]},
+            "response_message": f"analyzed {service}"
+        }
+
+    async def process_message(self, message):
+        self.messages.append(message)
+        await asyncio.sleep(self.delay)
+        content = message.content
+
+        if "alerts" in content:
+            reply = {"batch_results": [
+                self._analysis(item["alert"]) for item in content["alerts"]]}
+        elif "alert" in content:
+            reply = self._analysis(content["alert"])
+            if reply is None:
+                return None
+        elif "service_names" in content:
+            reply = {"batch_results": [
+                {"correlations": [name]} for name in content["service_names"]]}
+        else:
+            reply = {"correlations": [content["service_name"]]}
+
+        return create_message("analysis_agent", message.sender,
+                              MessageType.INSIGHT, reply)
+
+
+@pytest.fixture
+def make_executor(monkeypatch):
+    """Build executors whose analysis agent is a stub"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+    agent_ids = set()
+
+    def make(stub: StubAnalysisAgent) -> WatchTowerExecutor:
+        executor = WatchTowerExecutor()
+        agent_ids.update(executor.agents)
+        executor.agents["analysis_agent"] = stub
+        return executor
+
+    yield make
+
+    # The executor registers its real agents with the global hub
+    for agent_id in agent_ids:
+        communication_hub.unregister_agent(agent_id)
+
+
+def _alert(index: int):
+    return {
+        "service_name": f"service-{index}",
+        "severity": "warning",
+        "message": f"alert {index}",
+        "timestamp": "2024-01-01T00:00:00"
+    }
+
+
+def test_concurrent_alerts_get_their_own_results(make_executor):
+    """Alerts batched into one run each resolve with their own result"""
+
+    async def run():
+        stub = StubAnalysisAgent()
+        executor = make_executor(stub)
+
+        try:
+            results = await asyncio.gather(
+                *(executor.process_alert(_alert(i), {"value": i})
+                  for i in range(5)))
+        finally:
+            await executor.stop()
+
+        # One batched run: one analysis and one correlation message
+        assert len(stub.messages) == 2
+        assert executor.workflows_executed == 1
+
+        for i, result in enumerate(results):
+            assert result.success
+            assert result.result["alert_info"]["service_name"] == f"service-{i}"
+            final = result.result["final_response"]
+            assert final["alert_summary"] == f"Alert from service-{i}: alert {i}"
+            assert final["analysis_findings"] == [f"service-{i} finding"]
+            assert final["affected_services"] == [f"service-{i}"]
+            assert final["response_message"] == f"analyzed service-{i}"
+
+    asyncio.run(run())
+
+
+def test_failed_alert_in_batch_fails_only_its_caller(make_executor):
+    """One alert failing analysis does not pass as a success or sink others"""
+
+    async def run():
+        stub = StubAnalysisAgent()
+        executor = make_executor(stub)
+        alerts = [_alert(0), {**_alert(1), "service_name": "service-fail"},
+                  _alert(2)]
+
+        try:
+            results = await asyncio.gather(
+                *(executor.process_alert(alert, {}) for alert in alerts))
+            single = await executor.process_alert(alerts[1], {})
+        finally:
+            await executor.stop()
+
+        ok_first, failed, ok_last = results
+        assert ok_first.success and ok_last.success
+        assert ok_last.result["final_response"]["response_message"] == "analyzed service-2"
+
+        assert not failed.success
+        assert failed.error_message == "Failed to analyze alert"
+        assert "final_response" not in failed.result
+        assert failed.result["alert_info"]["service_name"] == "service-fail"
+
+        # Same outcome as the alert failing on its own
+        assert not single.success
+        assert single.error_message == failed.error_message
+
+    asyncio.run(run())
+
+
+def test_stop_fails_alerts_not_yet_processed(make_executor):
+    """Alerts still waiting for a batch fail when the executor stops"""
+
+    async def run():
+        stub = StubAnalysisAgent()
+        executor = make_executor(stub)
+
+        pending = [asyncio.create_task(executor.process_alert(_alert(i), {}))
+                   for i in range(3)]
+        # Let the alerts reach the batcher, but stop inside its window
+        await asyncio.sleep(0.01)
+        await executor.stop()
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*pending, return_exceptions=True), timeout=1)
+        assert not stub.messages
+        for result in results:
+            assert isinstance(result, RuntimeError)
+            assert "stopped" in str(result)
+
+    asyncio.run(run())
@@ -0,0 +1,131 @@
+"""
+Test analysis agent dependency handling
+File: backend/tests/test_analysis_agent.py
+"""
+
+import asyncio
+import os
+import re
+import sys
+from collections import deque
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agents.analysis_agent import AnalysisAgent  # noqa: E402
+
+
+class StubPrometheusClient:
+    """Answers `up` queries from a per-dependency table"""
+
+    def __init__(self, values, fail_batched: bool = False):
+        # dependency -> up value, or an exception to raise
+        self.values = values
+        self.fail_batched = fail_batched
+        self.queries = []
+
+    async def query_metric(self, query):
+        self.queries.append(query)
+        matched = [dep for dep in self.values if dep in query]
+        if self.fail_batched and len(matched) > 1:
+            raise ConnectionError("batched query failed")
+
+        series = []
+        for dep in matched:
+            value = self.values[dep]
+            if isinstance(value, Exception):
+                raise value
+            series.append({"metric": {"job": dep}, "value": [0, str(value)]})
+        return {"status": "success", "data": {"data": {"result": series}}}
+
+
+def test_dependency_health_uses_one_query():
+    """Healthy and unhealthy dependencies are told apart from one query"""
+    agent = AnalysisAgent()
+    agent.prometheus_client = StubPrometheusClient({"mysql": 0, "redis": 1})
+
+    unhealthy = asyncio.run(agent._check_dependency_health(["mysql", "redis"]))
+
+    assert unhealthy == ["mysql"]
+    assert len(agent.prometheus_client.queries) == 1
+
+
+def test_dependency_health_falls_back_per_dependency():
+    """A failed batched query is retried per dependency"""
+    agent = AnalysisAgent()
+    agent.prometheus_client = StubPrometheusClient(
+        {"mysql": 0, "redis": ConnectionError("down"), "kafka": 1},
+        fail_batched=True)
+
+    unhealthy = asyncio.run(
+        agent._check_dependency_health(["mysql", "redis", "kafka"]))
+
+    # The erroring dependency is skipped; the others are still checked
+    assert unhealthy == ["mysql"]
+    assert len(agent.prometheus_client.queries) == 4
+
+
+def test_up_query_escapes_names_for_promql():
+    """Dependency names match literally and leave a valid PromQL string"""
+    agent = AnalysisAgent()
+    query = agent._up_query(("api-gateway", "mysql.primary"))
+
+    assert query == r'up{job=~".*(api-gateway|mysql\\.primary).*"}'
+
+    # Decode the PromQL string literal, then use it as the regex it holds
+    literal = query[len('up{job=~"'):-len('"}')]
+    pattern = re.compile(literal.replace("\\\\", "\\"))
+    assert pattern.fullmatch("banking-api-gateway")
+    assert pattern.fullmatch("mysql.primary")
+    assert not pattern.fullmatch("mysqlXprimary")
+
+
+def _brute_force_dependents(reverse):
+    """Every service reachable over dependent edges, found by BFS per node"""
+    nodes = set(reverse) | {svc for deps in reverse.values() for svc in deps}
+    closure = {}
+    for node in nodes:
+        seen = set()
+        queue = deque(reverse.get(node, ()))
+        while queue:
+            dependent = queue.popleft()
+            if dependent not in seen:
+                seen.add(dependent)
+                queue.extend(reverse.get(dependent, ()))
+        seen.discard(node)
+        closure[node] = frozenset(seen)
+    return closure
+
+
+def test_transitive_dependents_match_bfs_on_real_dependency_map():
+    """The closure handles the transaction_service/fraud_detection cycle"""
+    agent = AnalysisAgent()
+    reverse = agent._reverse_dep_map
+
+    # The shipped map really is cyclic
+    assert "fraud_detection" in reverse["transaction_service"]
+    assert "transaction_service" in reverse["fraud_detection"]
+
+    assert agent._transitive_dependents == _brute_force_dependents(reverse)
+    assert "fraud_detection" in agent._transitive_dependents["transaction_service"]
+    assert "transaction_service" in agent._transitive_dependents["fraud_detection"]
+
+
+def test_transitive_dependents_match_bfs_with_cycle_feeding_a_chain():
+    """Nodes on, above and below a cycle all get the full closure"""
+    agent = AnalysisAgent()
+    # Edges point from a service to the services that depend on it
+    agent._reverse_dep_map = {
+        "db": {"a"},
+        "a": {"b"},
+        "b": {"a", "c"},
+        "c": {"d"},
+        "cache": {"d"},
+    }
+
+    closure = agent._build_transitive_dependents()
+
+    assert closure == _brute_force_dependents(agent._reverse_dep_map)
+    assert closure["db"] == {"a", "b", "c", "d"}
+    assert closure["a"] == {"b", "c", "d"}
+    assert closure["d"] == frozenset()
@@ -0,0 +1,190 @@
+"""
+Test agent communication hub message delivery
+File: backend/tests/test_communication_hub.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agents.base_agent import (  # noqa: E402
+    AgentCommunicationHub, AgentType, BaseAgent, MessageType, create_message
+)
+
+
+class RecordingAgent(BaseAgent):
+    """Agent that records when each message is handled"""
+
+    def __init__(self, agent_id: str, delay: float = 0.0):
+        super().__init__(agent_id, AgentType.QUERY)
+        self.delay = delay
+        self.handled = []
+
+    async def process_message(self, message):
+        await asyncio.sleep(self.delay)
+        self.handled.append((message.id, time.monotonic()))
+        return None
+
+    async def background_task(self):
+        pass
+
+
+def _query(recipient: str):
+    return create_message("tester", recipient, MessageType.QUERY, {})
+
+
+async def _wait_for(condition, timeout: float = 1.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+def test_slow_agent_does_not_block_others():
+    """A slow agent's batch must not hold up delivery to other agents"""
+
+    async def run():
+        hub = AgentCommunicationHub()
+        slow = RecordingAgent("slow", delay=2.0)
+        fast = RecordingAgent("fast")
+        hub.register_agent(slow)
+        hub.register_agent(fast)
+        await hub.start_all_agents()
+
+        try:
+            await hub.send_message(_query("slow"))
+            await asyncio.sleep(0.05)
+            sent = time.monotonic()
+            await hub.send_message(_query("fast"))
+
+            for _ in range(50):
+                if fast.handled:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert fast.handled, "fast agent never handled its message"
+            assert fast.handled[0][1] - sent < 0.5
+            assert not slow.handled
+        finally:
+            await hub.stop_all_agents()
+
+    asyncio.run(run())
+
+
+def test_message_for_stopped_agent_is_delivered_after_start():
+    """Messages queued before start() are held, not dropped"""
+
+    async def run():
+        hub = AgentCommunicationHub()
+        idle = RecordingAgent("idle")
+        other = RecordingAgent("other")
+        hub.register_agent(idle)
+        hub.register_agent(other)
+        await other.start()
+
+        try:
+            message = _query("idle")
+            await hub.send_message(message)
+            await asyncio.sleep(0.1)
+            assert not idle.handled
+            assert idle.queue_size() == 1
+
+            await idle.start()
+            for _ in range(50):
+                if idle.handled:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert [message_id for message_id, _ in idle.handled] == [message.id]
+            assert idle.queue_size() == 0
+        finally:
+            await hub.stop_all_agents()
+
+    asyncio.run(run())
+
+
+def test_running_agent_switches_delivery_on_register_and_unregister():
+    """A running agent keeps receiving messages when it joins or leaves a hub"""
+
+    async def run():
+        hub = AgentCommunicationHub()
+        agent = RecordingAgent("switch")
+        await agent.start()
+
+        try:
+            hub.register_agent(agent)
+            first = _query("switch")
+            await hub.send_message(first)
+            await _wait_for(lambda: len(agent.handled) == 1)
+            assert [message_id for message_id, _ in agent.handled] == [first.id]
+
+            hub.unregister_agent(agent.agent_id)
+            second = _query("switch")
+            await agent.receive_message(second)
+            await _wait_for(lambda: len(agent.handled) == 2)
+            assert agent.handled[-1][0] == second.id
+        finally:
+            await agent.stop()
+            await hub.stop_all_agents()
+
+    asyncio.run(run())
+
+
+def test_stop_all_agents_cancels_in_flight_batches():
+    """Stopping the hub does not leave batch tasks running"""
+
+    async def run():
+        hub = AgentCommunicationHub()
+        slow = RecordingAgent("slow", delay=5.0)
+        hub.register_agent(slow)
+        await hub.start_all_agents()
+
+        await hub.send_message(_query("slow"))
+        await _wait_for(lambda: "slow" in hub._agent_batches)
+        batch = hub._agent_batches["slow"]
+
+        await hub.stop_all_agents()
+        assert batch.cancelled()
+        assert not hub._agent_batches
+        assert not slow.handled
+
+    asyncio.run(run())
+
+
+def test_high_priority_sender_waits_for_room_in_full_backlog():
+    """A full agent makes priority-3 senders wait and sheds priority 1"""
+
+    async def run():
+        hub = AgentCommunicationHub()
+        agent = RecordingAgent("full")
+        agent.max_queue_size = 2
+        hub.register_agent(agent)
+
+        try:
+            for _ in range(2):
+                await hub.send_message(_query("full"))
+            assert agent.queue_full()
+
+            # Low priority is shed instead of waiting
+            await asyncio.wait_for(hub.send_message(_query("full")), 0.1)
+            assert agent.queue_size() == 2
+
+            urgent = create_message(
+                "tester", "full", MessageType.QUERY, {}, priority=3)
+            sender = asyncio.create_task(hub.send_message(urgent))
+            await asyncio.sleep(0.1)
+            assert not sender.done()
+
+            # Starting the agent drains its backlog and lets the sender in
+            await agent.start()
+            await asyncio.wait_for(sender, 1)
+            await _wait_for(lambda: len(agent.handled) == 3)
+            assert urgent.id in [message_id for message_id, _ in agent.handled]
+        finally:
+            await hub.stop_all_agents()
+
+    asyncio.run(run())
@@ -0,0 +1,101 @@
+"""
+Test health agent alert lifecycle
+File: backend/tests/test_health_agent.py
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agents.alert_agent import HealthAgent, HealthMetric, HealthStatus  # noqa: E402
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _critical_metric(agent: HealthAgent, service_name: str = "account_service"):
+    return HealthMetric(
+        service_name=service_name,
+        metric_name="service_health",
+        current_value=0.0,
+        threshold_warning=1.0,
+        threshold_critical=0.0,
+        status=HealthStatus.CRITICAL,
+        timestamp=agent._cycle_now,
+        ts_float=agent._cycle_monotonic,
+        trend="stable"
+    )
+
+
+def _at(agent: HealthAgent, when: datetime, monotonic: float):
+    agent._cycle_now = when
+    agent._cycle_monotonic = monotonic
+
+
+def test_alert_auto_resolves_strictly_after_deadline():
+    """The expiry heap and _should_resolve_alert agree at the boundary"""
+
+    async def run():
+        agent = HealthAgent()
+        _at(agent, START, 0.0)
+        await agent._create_alert(_critical_metric(agent))
+        assert len(agent.active_alerts) == 1
+
+        deadline = START + timedelta(seconds=agent.alert_auto_resolve)
+
+        # Exactly at the deadline the alert stays active and stays scheduled
+        _at(agent, deadline, float(agent.alert_auto_resolve))
+        await agent._evaluate_alerts()
+        assert len(agent.active_alerts) == 1
+        assert len(agent._alert_expiry) == 1
+
+        # One microsecond later the heap hands it over and it resolves
+        _at(agent, deadline + timedelta(microseconds=1),
+            agent.alert_auto_resolve + 1e-6)
+        await agent._evaluate_alerts()
+        assert not agent.active_alerts
+        assert not agent._alert_expiry
+        assert not agent._alert_index
+
+    asyncio.run(run())
+
+
+def test_equal_content_alert_is_suppressed_until_pruned():
+    """Identical alerts are suppressed within the cooldown, then re-raised"""
+
+    async def run():
+        agent = HealthAgent()
+        _at(agent, START, 0.0)
+        await agent._create_alert(_critical_metric(agent))
+        assert len(agent.active_alerts) == 1
+        assert len(agent._pending_alerts) == 1
+
+        # The alert is cleared (e.g. resolved) but the same content fires again
+        agent.active_alerts.clear()
+        agent._alert_index.clear()
+        _at(agent, START + timedelta(seconds=60), 60.0)
+        await agent._create_alert(_critical_metric(agent))
+        assert not agent.active_alerts
+        assert len(agent._pending_alerts) == 1
+
+        # Different content is not a duplicate
+        await agent._create_alert(_critical_metric(agent, "auth_service"))
+        assert len(agent.active_alerts) == 1
+        agent.active_alerts.clear()
+        agent._alert_index.clear()
+
+        # After every cooldown the signatures are pruned and the alert returns
+        later = 60.0 + agent.alert_cooldown + 1.0
+        _at(agent, START + timedelta(seconds=later), later)
+        agent._prune_signatures()
+        assert not agent._signature_seen
+        assert not agent._signature_expiry
+
+        await agent._create_alert(_critical_metric(agent))
+        assert len(agent.active_alerts) == 1
+        assert len(agent._pending_alerts) == 3
+
+    asyncio.run(run())